@@ -2,16 +2,213 @@
 Analytics module for calculating YoY, QoQ metrics and generating insights
 """
 
+import asyncio
+import hashlib
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import numpy as np
 import logging
 
-from database import DatabaseManager
+from cache import AsyncTTLCache, LRUCache
+from config import settings
+from database import DatabaseManager, to_dataframe
+
+try:
+    import numbagg
+except ImportError:  # optional accelerator
+    numbagg = None
+
+try:
+    import polars as pl
+except ImportError:  # optional accelerator
+    pl = None
 
 logger = logging.getLogger(__name__)
 
+# Filtered responses are memoized per filter combination and data version
+FILTERED_DATA_CACHE_SIZE = 256
+FILTERED_DATA_CACHE_TTL = 60
+FILTERED_DATA_CACHE_DIR = "./.cache/analytics"
+
+# Metrics are memoized on a content digest of the input frame
+METRICS_CACHE_SIZE = 128
+
+# pandas/NumPy work runs off the event loop on a bounded pool so high request rates
+# don't oversubscribe the CPU
+ANALYTICS_WORKERS = 4
+
+# Vehicle categories shown on the chart, normalized to lowercase for the frontend
+CHART_CATEGORY_COLUMNS = {'2W': '2w', '3W': '3w', '4W': '4w'}
+
+USE_NUMBA_GROUPBY = settings.ANALYTICS_NUMBA_GROUPBY and numbagg is not None
+if settings.ANALYTICS_NUMBA_GROUPBY and numbagg is None:
+    logger.warning("ANALYTICS_NUMBA_GROUPBY is enabled but numbagg is not installed; using pandas groupby")
+
+USE_POLARS = settings.ANALYTICS_POLARS and pl is not None
+if settings.ANALYTICS_POLARS and pl is None:
+    logger.warning("ANALYTICS_POLARS is enabled but polars is not installed; using pandas")
+
+if USE_NUMBA_GROUPBY:
+    # Trigger JIT compilation at import so the first request doesn't pay for it
+    numbagg.group_nansum(np.zeros(2), np.zeros(2, dtype=np.intp), num_labels=1)
+
+def _grouped_sum(df: pd.DataFrame, keys: List[str]) -> pd.Series:
+    """
+    Sum registrations per unique combination of ``keys``, sorted by key
+    """
+    if not USE_NUMBA_GROUPBY:
+        return df.groupby(keys, observed=True)['registrations'].sum()
+    
+    # Factorize each key and fold the codes into one int64 label per row
+    combined = np.zeros(len(df), dtype=np.int64)
+    levels = []
+    for key in keys:
+        key_codes, key_uniques = pd.factorize(df[key], sort=True)
+        combined = combined * len(key_uniques) + key_codes
+        levels.append(key_uniques)
+    
+    labels, observed = pd.factorize(combined, sort=True)
+    totals = numbagg.group_nansum(
+        df['registrations'].to_numpy(dtype=np.float64), labels, num_labels=len(observed)
+    )
+    
+    codes = np.unravel_index(observed, [len(level) for level in levels])
+    index = pd.MultiIndex(levels=levels, codes=codes, names=keys)
+    return pd.Series(totals.astype(np.int64), index=index, name='registrations')
+
+def _latest_changes(df: pd.DataFrame, group_by: str) -> pd.DataFrame:
+    """
+    Total registrations and latest YoY / QoQ change (percent) per group
+    """
+    # Aggregate all groups in one pass; the sorted group keys keep pct_change chronological
+    yearly_data = _grouped_sum(df, [group_by, 'year'])
+    yoy_change = yearly_data.groupby(level=0, observed=True).pct_change() * 100
+    
+    quarterly_data = _grouped_sum(df, [group_by, 'year', 'quarter'])
+    qoq_change = quarterly_data.groupby(level=0, observed=True).pct_change() * 100
+    
+    # Latest year / quarter value per group: the chronologically last (year, quarter),
+    # not the highest quarter number seen in any year
+    summary = pd.DataFrame({
+        "total_registrations": yearly_data.groupby(level=0, observed=True).sum(),
+        "yoy_change": yoy_change.groupby(level=0, observed=True).tail(1).droplevel('year'),
+        "qoq_change": qoq_change.groupby(level=0, observed=True).tail(1).droplevel(['year', 'quarter'])
+    })
+    summary.index.name = group_by
+    return summary
+
+def _latest_changes_polars(df: pd.DataFrame, group_by: str) -> pd.DataFrame:
+    """
+    Polars version of _latest_changes, grouping on the Categorical codes
+    """
+    keys = df[group_by]
+    frame = pl.DataFrame({
+        "code": keys.cat.codes.to_numpy(),
+        "year": df['year'].to_numpy(),
+        "quarter": df['quarter'].to_numpy(),
+        "registrations": df['registrations'].to_numpy().astype(np.int64)
+    }).lazy()
+    registrations = pl.col("registrations")
+    
+    # Sorting before a maintain_order group_by keeps each group's periods chronological
+    yearly = (frame.group_by(["code", "year"]).agg(registrations.sum())
+              .sort(["code", "year"])
+              .group_by("code", maintain_order=True)
+              .agg(registrations.sum().alias("total_registrations"),
+                   (registrations.pct_change() * 100).last().alias("yoy_change")))
+    quarterly = (frame.group_by(["code", "year", "quarter"]).agg(registrations.sum())
+                 .sort(["code", "year", "quarter"])
+                 .group_by("code", maintain_order=True)
+                 .agg((registrations.pct_change() * 100).last().alias("qoq_change")))
+    result = yearly.join(quarterly, on="code").sort("code").collect()
+    
+    names = keys.cat.categories.to_numpy()[result["code"].to_numpy()]
+    return pd.DataFrame({
+        "total_registrations": result["total_registrations"].to_numpy(),
+        "yoy_change": result["yoy_change"].fill_null(np.nan).to_numpy(),
+        "qoq_change": result["qoq_change"].fill_null(np.nan).to_numpy()
+    }, index=pd.Index(names, name=group_by))
+
+# Query results arrive from DatabaseManager as column arrays (see DatabaseManager._to_columns);
+# frames are only built where pandas groupby does the work
+Columns = Dict[str, np.ndarray]
+
+def _row_count(columns: Columns) -> int:
+    return len(columns['registrations'])
+
+def _period_months(columns: Columns) -> np.ndarray:
+    """
+    Month count since the epoch of each row's date
+    """
+    return columns['date'].astype('datetime64[M]').astype(np.int32)
+
+def _last_months(columns: Columns, months: int = 12) -> Columns:
+    """
+    Keep only the rows that fall in the latest ``months`` distinct months
+    """
+    row_months = _period_months(columns)
+    month_keys = np.unique(row_months)
+    if len(month_keys) <= months:
+        return columns
+    keep = row_months >= month_keys[-months]
+    return {name: values[keep] for name, values in columns.items()}
+
+def _coded_sums(keys: np.ndarray, registrations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sum registrations per distinct key, sorted by key
+    """
+    codes, names = pd.factorize(keys, sort=True)
+    totals = np.bincount(codes, weights=registrations, minlength=len(names))
+    return np.asarray(names, dtype=object), totals
+
+def _month_labels(month_keys: pd.Index) -> pd.Index:
+    """
+    Format months-since-epoch keys as YYYY-MM labels
+    """
+    months = month_keys.to_numpy().astype('datetime64[M]')
+    return pd.Index(np.datetime_as_string(months, unit='M'), name='month')
+
+def _monthly_table(columns: Columns, column: str) -> pd.DataFrame:
+    """
+    Registrations per month (rows, labelled YYYY-MM) and ``column`` value (columns)
+    """
+    month_keys = _period_months(columns)
+    if (month_keys == month_keys[0]).all():
+        # One month: a single bincount row, no groupby/unstack needed
+        names, totals = _coded_sums(columns[column], columns['registrations'])
+        table = pd.DataFrame(
+            [totals.astype(np.int64)], index=pd.Index(month_keys[:1]), columns=pd.Index(names, name=column)
+        )
+    else:
+        df = pd.DataFrame({
+            'period_M': month_keys, column: columns[column], 'registrations': columns['registrations']
+        })
+        table = df.groupby(['period_M', column])['registrations'].sum().unstack(column, fill_value=0)
+    
+    # Format the month keys as strings for JSON serialization
+    table.index = _month_labels(table.index)
+    return table
+
+def _pivot_records(pivot: Dict[str, np.ndarray]) -> List[Dict]:
+    """
+    Chart rows from get_category_pivot arrays, shaped like the grouped vehicle chart
+    
+    A category column appears when the category has rows in any charted month,
+    with 0 for the months it has none, as unstack(fill_value=0) would give.
+    """
+    labels = [f"{year:04d}-{month:02d}" for year, month in zip(pivot['year'].tolist(), pivot['month'].tolist())]
+    columns = {'month': labels}
+    for cat, chart_column in CHART_CATEGORY_COLUMNS.items():
+        values = pivot.get(cat)
+        if values is not None and not np.isnan(values).all():
+            columns[chart_column] = np.nan_to_num(values).astype(np.int64).tolist()
+    columns['total'] = pivot['total'].tolist()
+    
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
 class VehicleAnalytics:
     """
     Provides analytics capabilities for vehicle registration data
@@ -19,6 +216,20 @@ class VehicleAnalytics:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self._filtered_cache = AsyncTTLCache(
+            maxsize=FILTERED_DATA_CACHE_SIZE,
+            ttl=FILTERED_DATA_CACHE_TTL,
+            disk_dir=FILTERED_DATA_CACHE_DIR
+        )
+        self._metrics_cache = LRUCache(maxsize=METRICS_CACHE_SIZE)
+        # Created on first use and released by close()
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def close(self):
+        """Shut down the analytics thread pool without waiting for running work"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
     
     async def get_filtered_data(
         self,
@@ -29,192 +240,218 @@ class VehicleAnalytics:
     ) -> Dict:
         """
         Get filtered data with YoY and QoQ calculations
+        Results are cached per normalized filter set until the data changes
         """
         try:
-            # Get vehicle category data
-            vehicle_data = await self.db.get_vehicle_data(start_date, end_date, category)
-            
-            # Get manufacturer data
-            manufacturer_data = await self.db.get_manufacturer_data(
-                start_date, end_date, manufacturers, category
+            key = (start_date, end_date, category, tuple(sorted(manufacturers or ())))
+            version = await self.db.get_cache_version()
+            return await self._filtered_cache.get_or_compute(
+                key, version,
+                lambda: self._compute_filtered_data(start_date, end_date, category, list(key[3]) or None)
             )
             
-            # Calculate metrics
-            vehicle_metrics = self._calculate_yoy_qoq_metrics(vehicle_data, 'category')
-            manufacturer_metrics = self._calculate_yoy_qoq_metrics(manufacturer_data, 'manufacturer')
-            
-            # Prepare chart data
-            chart_data = self._prepare_chart_data(vehicle_data, manufacturer_data, category, manufacturers)
-            
-            return {
-                "chart_data": chart_data,
-                "vehicle_metrics": vehicle_metrics,
-                "manufacturer_metrics": manufacturer_metrics,
-                "summary": self._calculate_summary_stats(vehicle_data, manufacturer_data)
-            }
-            
         except Exception as e:
             logger.error(f"Error in get_filtered_data: {str(e)}")
             raise
     
-    def _calculate_yoy_qoq_metrics(self, df: pd.DataFrame, group_by: str) -> List[Dict]:
+    async def _compute_filtered_data(
+        self,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        category: Optional[str],
+        manufacturers: Optional[List[str]]
+    ) -> Dict:
+        """
+        Fetch and aggregate the data behind get_filtered_data
+        """
+        # Every calculation below only needs per-month totals: whole-month ranges are
+        # answered from the monthly rollups, anything else is grouped inside SQLite
+        if self.db.can_use_monthly_rollup(start_date, end_date):
+            fetch_vehicle = self.db.get_vehicle_monthly_rollup(start_date, end_date, category)
+            fetch_manufacturer = self.db.get_manufacturer_monthly_rollup(start_date, end_date, manufacturers, category)
+        else:
+            fetch_vehicle = self.db.get_category_timeseries(start_date, end_date, category)
+            fetch_manufacturer = self.db.get_manufacturer_timeseries(start_date, end_date, manufacturers, category)
+        
+        # The queries run concurrently on the database's read-only connections; without a
+        # manufacturer selection the chart is the category crosstab, which SQLite builds directly
+        if manufacturers:
+            vehicle_data, manufacturer_data = await asyncio.gather(fetch_vehicle, fetch_manufacturer)
+            category_pivot = None
+        else:
+            vehicle_data, manufacturer_data, category_pivot = await asyncio.gather(
+                fetch_vehicle, fetch_manufacturer, self.db.get_category_pivot(start_date, end_date, category)
+            )
+        
+        # Calculate metrics, chart data and summary in worker threads; NumPy and
+        # pandas release the GIL for most of this work
+        vehicle_metrics, manufacturer_metrics, chart_data, summary = await asyncio.gather(
+            self._run_in_executor(self._calculate_yoy_qoq_metrics, vehicle_data, 'category'),
+            self._run_in_executor(self._calculate_yoy_qoq_metrics, manufacturer_data, 'manufacturer'),
+            self._run_in_executor(
+                self._prepare_chart_data, vehicle_data, manufacturer_data, category, manufacturers, category_pivot
+            ),
+            self._run_in_executor(self._calculate_summary_stats, vehicle_data, manufacturer_data)
+        )
+        
+        return {
+            "chart_data": chart_data,
+            "vehicle_metrics": vehicle_metrics,
+            "manufacturer_metrics": manufacturer_metrics,
+            "summary": summary
+        }
+    
+    async def _run_in_executor(self, func: Callable, *args) -> Any:
+        """Run a CPU-bound helper on the analytics thread pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=ANALYTICS_WORKERS, thread_name_prefix="analytics")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    def _calculate_yoy_qoq_metrics(self, columns: Columns, group_by: str) -> List[Dict]:
         """
         Calculate Year-over-Year and Quarter-over-Quarter metrics
         """
-        if df.empty:
+        if not _row_count(columns):
             return []
         
-        # Convert date column to datetime
-        df['date'] = pd.to_datetime(df['date'])
+        # Dates are parsed by DatabaseManager
+        assert columns['date'].dtype.kind == 'M'
         
-        metrics = []
+        # A single quarter has nothing to compare against: report totals only
+        years = columns['year']
+        quarters = columns['quarter']
+        if (years == years[0]).all() and (quarters == quarters[0]).all():
+            groups, totals = _coded_sums(columns[group_by], columns['registrations'])
+            order = np.argsort(-totals, kind='stable')
+            return [
+                {
+                    group_by: group_value,
+                    "total_registrations": int(total),
+                    "yoy_change": 0.0,
+                    "qoq_change": 0.0,
+                    "trend": "stable"
+                }
+                for group_value, total in zip(groups[order], totals[order])
+            ]
         
-        for group_value in df[group_by].unique():
-            group_data = df[df[group_by] == group_value].copy()
-            group_data = group_data.sort_values('date')
-            
-            # Calculate YoY metrics
-            yearly_data = group_data.groupby(['year'])['registrations'].sum().reset_index()
-            yearly_data['yoy_change'] = yearly_data['registrations'].pct_change() * 100
-            
-            # Calculate QoQ metrics
-            quarterly_data = group_data.groupby(['year', 'quarter'])['registrations'].sum().reset_index()
-            quarterly_data['qoq_change'] = quarterly_data['registrations'].pct_change() * 100
-            
-            # Get latest metrics
-            latest_year = yearly_data['year'].max()
-            latest_quarter = quarterly_data['quarter'].max()
-            
-            latest_yoy = yearly_data[yearly_data['year'] == latest_year]['yoy_change'].iloc[0] if len(yearly_data) > 1 else 0
-            latest_qoq = quarterly_data[quarterly_data['quarter'] == latest_quarter]['qoq_change'].iloc[-1] if len(quarterly_data) > 1 else 0
-            
-            latest_registrations = group_data['registrations'].sum()
-            
-            metrics.append({
-                group_by: group_value,
-                "total_registrations": int(latest_registrations),
-                "yoy_change": round(float(latest_yoy), 2) if not np.isnan(latest_yoy) else 0,
-                "qoq_change": round(float(latest_qoq), 2) if not np.isnan(latest_qoq) else 0,
-                "trend": "up" if latest_yoy > 0 else "down" if latest_yoy < 0 else "stable"
-            })
+        # get_insights and get_filtered_data often compute metrics for identical frames
+        fingerprint = self._metrics_fingerprint(columns, group_by)
+        cached = self._metrics_cache.get(fingerprint)
+        if cached is not None:
+            return [dict(metric) for metric in cached]
+        
+        # Latest year / quarter change and total per group, grouped by pandas (or polars)
+        df = to_dataframe(columns)
+        if USE_POLARS:
+            summary = _latest_changes_polars(df, group_by)
+        else:
+            summary = _latest_changes(df, group_by)
+        summary = summary.sort_values("total_registrations", ascending=False, kind="stable")
+        
+        # Trend follows the raw YoY sign, so groups without a prior year are "stable"
+        summary["trend"] = np.where(
+            summary["yoy_change"] > 0, "up", np.where(summary["yoy_change"] < 0, "down", "stable")
+        )
+        summary["yoy_change"] = summary["yoy_change"].round(2).fillna(0)
+        summary["qoq_change"] = summary["qoq_change"].round(2).fillna(0)
+        
+        metrics = summary.reset_index().to_dict('records')
+        
+        self._metrics_cache.set(fingerprint, tuple(metrics))
+        return [dict(metric) for metric in metrics]
+    
+    def _metrics_fingerprint(self, columns: Columns, group_by: str) -> Tuple:
+        """
+        Content digest of exactly the columns the metric calculation reads
         
-        return sorted(metrics, key=lambda x: x["total_registrations"], reverse=True)
+        Any change to a group's per-quarter numbers changes the digest, so a memoized
+        result is only reused for identical input.
+        """
+        digest = hashlib.sha1()
+        for name in (group_by, 'year', 'quarter', 'registrations'):
+            digest.update(pd.util.hash_array(columns[name]).tobytes())
+        return (group_by, _row_count(columns), digest.hexdigest())
     
-    def _prepare_chart_data(self, vehicle_data: pd.DataFrame, manufacturer_data: pd.DataFrame, 
-                           category: Optional[str] = None, manufacturers: Optional[List[str]] = None) -> List[Dict]:
+    def _prepare_chart_data(self, vehicle_data: Columns, manufacturer_data: Columns, 
+                           category: Optional[str] = None, manufacturers: Optional[List[str]] = None,
+                           category_pivot: Optional[Dict[str, np.ndarray]] = None) -> List[Dict]:
         """
         Prepare data for charts in the format expected by the frontend
-        Handles both vehicle category and manufacturer filtering
+        Handles both vehicle category and manufacturer filtering; ``category_pivot``
+        (from get_category_pivot) replaces grouping vehicle_data when given
         """
-        if vehicle_data.empty and manufacturer_data.empty:
+        if not _row_count(vehicle_data) and not _row_count(manufacturer_data):
             return []
         
         result = []
         
         # If manufacturers are selected, show manufacturer-specific data
         if manufacturers and len(manufacturers) > 0:
-            if not manufacturer_data.empty:
-                # Convert dates and sort
-                manufacturer_data['date'] = pd.to_datetime(manufacturer_data['date'])
-                manufacturer_data = manufacturer_data.sort_values('date')
+            if _row_count(manufacturer_data):
+                # Only the last 12 months are charted, so don't aggregate the rest
+                manufacturer_data = _last_months(manufacturer_data)
                 
-                # Filter by selected manufacturers
-                filtered_data = manufacturer_data[manufacturer_data['manufacturer'].isin(manufacturers)]
+                # The query already restricted the rows to the selected manufacturers
+                # Group by month with manufacturers as columns
+                chart_data = _monthly_table(manufacturer_data, 'manufacturer')
+                chart_data['total'] = chart_data.sum(axis=1)
                 
-                if not filtered_data.empty:
-                    # Group by month and manufacturer
-                    monthly_data = filtered_data.groupby([
-                        filtered_data['date'].dt.to_period('M'), 'manufacturer'
-                    ])['registrations'].sum().reset_index()
-                    
-                    # Convert period back to string for JSON serialization
-                    monthly_data['month'] = monthly_data['date'].astype(str)
-                    
-                    # Pivot to get manufacturers as columns
-                    chart_data = monthly_data.pivot(index='month', columns='manufacturer', values='registrations').fillna(0)
-                    
-                    # Convert to list of dictionaries for the frontend
-                    for month in chart_data.index:
-                        row = {"month": month}
-                        total = 0
-                        for manufacturer in chart_data.columns:
-                            value = int(chart_data.loc[month, manufacturer])
-                            row[manufacturer] = value
-                            total += value
-                        
-                        row["total"] = total
-                        result.append(row)
+                # Convert to a list of dictionaries for the frontend
+                result = chart_data.reset_index().to_dict('records')
+        
+        if not result and category_pivot is not None:
+            return _pivot_records(category_pivot)
         
         # If no manufacturers selected or manufacturer data is empty, show vehicle category data
-        if not result and not vehicle_data.empty:
-            # Convert dates and sort
-            vehicle_data['date'] = pd.to_datetime(vehicle_data['date'])
-            vehicle_data = vehicle_data.sort_values('date')
+        if not result and _row_count(vehicle_data):
+            # Only the last 12 months are charted, so don't aggregate the rest
+            vehicle_data = _last_months(vehicle_data)
             
-            # Filter by category if specified
-            if category:
-                vehicle_data = vehicle_data[vehicle_data['category'] == category]
+            # The query already applied the category filter
+            # Group by month with categories as columns
+            chart_data = _monthly_table(vehicle_data, 'category')
             
-            if not vehicle_data.empty:
-                # Group by month for better visualization
-                monthly_data = vehicle_data.groupby([
-                    vehicle_data['date'].dt.to_period('M'), 'category'
-                ])['registrations'].sum().reset_index()
-                
-                # Convert period back to string for JSON serialization
-                monthly_data['month'] = monthly_data['date'].astype(str)
-                
-                # Pivot to get categories as columns
-                chart_data = monthly_data.pivot(index='month', columns='category', values='registrations').fillna(0)
-                
-                # Convert to list of dictionaries for the frontend
-                for month in chart_data.index:
-                    row = {"month": month}
-                    total = 0
-                    for cat in chart_data.columns:
-                        value = int(chart_data.loc[month, cat])
-                        # Normalize category names to lowercase for frontend
-                        if cat == '2W':
-                            row['2w'] = value
-                        elif cat == '3W':
-                            row['3w'] = value
-                        elif cat == '4W':
-                            row['4w'] = value
-                        total += value
-                    
-                    row["total"] = total
-                    result.append(row)
+            # Every category counts toward the total, but only 2W/3W/4W are charted
+            total = chart_data.sum(axis=1)
+            charted = [cat for cat in chart_data.columns if cat in CHART_CATEGORY_COLUMNS]
+            chart_data = chart_data[charted].rename(columns=CHART_CATEGORY_COLUMNS)
+            chart_data['total'] = total
+            
+            # Convert to a list of dictionaries for the frontend
+            result = chart_data.reset_index().to_dict('records')
         
-        return result[-12:] if result else []  # Return last 12 months
+        return result
     
-    def _calculate_summary_stats(self, vehicle_data: pd.DataFrame, manufacturer_data: pd.DataFrame) -> Dict:
+    def _calculate_summary_stats(self, vehicle_data: Columns, manufacturer_data: Columns) -> Dict:
         """
         Calculate summary statistics
+        Accepts raw rows or monthly rollups (which carry each month's last_date)
         """
-        if vehicle_data.empty:
+        if not _row_count(vehicle_data):
             return {}
         
         total_registrations = vehicle_data['registrations'].sum()
         
         # Category breakdown
-        category_breakdown = vehicle_data.groupby('category')['registrations'].sum().to_dict()
+        categories, category_totals = _coded_sums(vehicle_data['category'], vehicle_data['registrations'])
+        category_breakdown = dict(zip(categories, category_totals))
         
         # Top manufacturers
-        top_manufacturers = []
-        if not manufacturer_data.empty:
-            top_manufacturers = (manufacturer_data.groupby('manufacturer')['registrations']
-                               .sum()
-                               .sort_values(ascending=False)
-                               .head(5)
-                               .to_dict())
+        top_manufacturers = {}
+        if _row_count(manufacturer_data):
+            names, totals = _coded_sums(manufacturer_data['manufacturer'], manufacturer_data['registrations'])
+            # Partial selection of the five largest, then order just those
+            top = np.argpartition(-totals, 5)[:5] if len(totals) > 5 else np.arange(len(totals))
+            top = top[np.argsort(-totals[top], kind='stable')]
+            top_manufacturers = dict(zip(names[top], totals[top]))
         
         return {
             "total_registrations": int(total_registrations),
             "category_breakdown": {k: int(v) for k, v in category_breakdown.items()},
             "top_manufacturers": {k: int(v) for k, v in top_manufacturers.items()},
             "data_period": {
-                "start": vehicle_data['date'].min() if not vehicle_data.empty else None,
-                "end": vehicle_data['date'].max() if not vehicle_data.empty else None
+                "start": pd.Timestamp(vehicle_data['date'].min()),
+                "end": pd.Timestamp(vehicle_data['last_date' if 'last_date' in vehicle_data else 'date'].max())
             }
         }
     
@@ -227,15 +464,19 @@ class VehicleAnalytics:
             end_date = datetime.now().strftime("%Y-%m-%d")
             start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
             
-            vehicle_data = await self.db.get_vehicle_data(start_date, end_date)
-            manufacturer_data = await self.db.get_manufacturer_data(start_date, end_date)
+            vehicle_data, manufacturer_data = await asyncio.gather(
+                self.db.get_category_timeseries(start_date, end_date),
+                self.db.get_manufacturer_timeseries(start_date, end_date)
+            )
             
             insights = []
             
-            if not vehicle_data.empty:
+            if _row_count(vehicle_data):
                 # Calculate YoY growth for insights
-                vehicle_metrics = self._calculate_yoy_qoq_metrics(vehicle_data, 'category')
-                manufacturer_metrics = self._calculate_yoy_qoq_metrics(manufacturer_data, 'manufacturer')
+                vehicle_metrics, manufacturer_metrics = await asyncio.gather(
+                    self._run_in_executor(self._calculate_yoy_qoq_metrics, vehicle_data, 'category'),
+                    self._run_in_executor(self._calculate_yoy_qoq_metrics, manufacturer_data, 'manufacturer')
+                )
                 
                 # Find top growth categories
                 for metric in vehicle_metrics:
@@ -261,9 +502,11 @@ class VehicleAnalytics:
                         })
                 
                 # Market share insights
-                total_registrations = sum([m['total_registrations'] for m in vehicle_metrics])
-                for metric in vehicle_metrics:
-                    market_share = (metric['total_registrations'] / total_registrations) * 100
+                totals = np.fromiter(
+                    (m['total_registrations'] for m in vehicle_metrics), dtype=np.float64, count=len(vehicle_metrics)
+                )
+                shares = totals / totals.sum() * 100
+                for metric, market_share in zip(vehicle_metrics, shares.tolist()):
                     insights.append({
                         "type": "market_share",
                         "title": f"{metric['category']} holds {market_share:.1f}% market share",
@@ -275,8 +518,9 @@ class VehicleAnalytics:
             return insights[:6]  # Return top 6 insights
             
         except Exception as e:
+            # Raised rather than answered with [], which the API would cache for the whole day
             logger.error(f"Error generating insights: {str(e)}")
-            return []
+            raise
     
     async def get_manufacturers(self) -> List[str]:
         """Get list of all manufacturers"""
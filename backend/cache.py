@@ -0,0 +1,169 @@
+"""
+Caching utilities for memoizing expensive analytics results
+"""
+
+import asyncio
+import hashlib
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU mapping for memoizing synchronous helpers
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for ``key`` and mark it as recently used"""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: Hashable, value: Any):
+        """Store ``value`` under ``key``, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+class AsyncTTLCache:
+    """
+    Two-level TTL/LRU cache for coroutine results
+
+    Entries live in an in-process LRU dict for ``ttl`` seconds and are mirrored
+    to ``disk_dir`` so results survive restarts; disk entries carry their write
+    time and expire after the same ``ttl``. Every entry is stored together
+    with the data version it was computed against; a different version is
+    treated as a miss, so bumping the version invalidates both levels.
+    Expired or stale files are deleted when read, and at most ``max_disk_entries``
+    files are kept, the least recently written going first.
+    """
+
+    def __init__(
+        self, maxsize: int = 256, ttl: float = 60, disk_dir: Optional[str] = None, max_disk_entries: int = 1024
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Any]]" = OrderedDict()
+        # Keyed by (key, version), so a caller at a newer version never joins an older computation
+        self._inflight: Dict[Tuple[Hashable, Any], asyncio.Future] = {}
+
+    async def get_or_compute(self, key: Hashable, version: Any, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key`` at ``version``, computing it on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, entry_version, value = entry
+            if entry_version == version and expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        # Concurrent misses for the same key share a single computation
+        pending = self._inflight.get((key, version))
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[(key, version)] = future
+        try:
+            loaded = await self._load_from_disk(key, version)
+            if loaded is None:
+                value, ttl = await compute(), self.ttl
+                await self._save_to_disk(key, version, value)
+            else:
+                value, ttl = loaded
+            self._store(key, version, value, ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody else may be awaiting the future; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            del self._inflight[(key, version)]
+
+    def _store(self, key: Hashable, version: Any, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: Hashable) -> Path:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}.pkl"
+
+    async def _load_from_disk(self, key: Hashable, version: Any) -> Optional[Tuple[Any, float]]:
+        if self.disk_dir is None:
+            return None
+        return await asyncio.to_thread(self._read_disk, key, version)
+
+    async def _save_to_disk(self, key: Hashable, version: Any, value: Any):
+        if self.disk_dir is None:
+            return
+        await asyncio.to_thread(self._write_disk, key, version, value)
+
+    def _read_disk(self, key: Hashable, version: Any) -> Optional[Tuple[Any, float]]:
+        """The stored value and its remaining lifetime, or None if missing, stale or expired"""
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, stored_version, stored_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Removing unreadable cache file {path}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if stored_key != key:
+            return None
+        # Wall-clock time, since the entry may have been written by an earlier process
+        remaining = self.ttl - (time.time() - stored_at)
+        if stored_version != version or remaining <= 0:
+            # Never readable again: a version only moves forward
+            path.unlink(missing_ok=True)
+            return None
+        return value, remaining
+
+    def _write_disk(self, key: Hashable, version: Any, value: Any):
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump((key, version, time.time(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+            self._prune_disk()
+        except Exception as e:
+            logger.warning(f"Could not write cache file {path}: {str(e)}")
+
+    def _prune_disk(self):
+        """Delete the oldest cache files beyond max_disk_entries"""
+        files = []
+        for path in self.disk_dir.glob("*.pkl"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort()
+        for _, path in files[:len(files) - self.max_disk_entries]:
+            path.unlink(missing_ok=True)
@@ -3,34 +3,42 @@ Configuration settings for the Vehicle Registration Dashboard
 """
 
 import os
+from dataclasses import dataclass, field
+from typing import Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
+@dataclass(frozen=True, slots=True)
 class Settings:
     # Database
-    DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///vehicle_data.db")
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///vehicle_data.db")
     
     # API Configuration
-    API_HOST = os.getenv("API_HOST", "0.0.0.0")
-    API_PORT = int(os.getenv("API_PORT", "8000"))
+    API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT: int = int(os.getenv("API_PORT", "8000"))
     
     # Vahan Dashboard Configuration
-    VAHAN_BASE_URL = os.getenv("VAHAN_BASE_URL", "https://vahan.parivahan.gov.in/vahan4dashboard/")
-    VAHAN_API_KEY = os.getenv("VAHAN_API_KEY", "")
+    VAHAN_BASE_URL: str = os.getenv("VAHAN_BASE_URL", "https://vahan.parivahan.gov.in/vahan4dashboard/")
+    VAHAN_API_KEY: str = field(default=os.getenv("VAHAN_API_KEY", ""), repr=False)
     
     # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
     # Development
-    DEBUG = os.getenv("DEBUG", "True").lower() == "true"
+    DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
+    
+    # Analytics: use numbagg's JIT-compiled grouped sums (requires `pip install numbagg`)
+    ANALYTICS_NUMBA_GROUPBY: bool = os.getenv("ANALYTICS_NUMBA_GROUPBY", "False").lower() == "true"
+    # Analytics: compute YoY/QoQ metrics with Polars (requires `pip install polars`)
+    ANALYTICS_POLARS: bool = os.getenv("ANALYTICS_POLARS", "False").lower() == "true"
     
     # CORS origins for development
-    CORS_ORIGINS = [
+    CORS_ORIGINS: Tuple[str, ...] = (
         "http://localhost:5173",  # Vite default
         "http://localhost:3000",  # Create React App default
         "http://127.0.0.1:5173",
         "http://127.0.0.1:3000"
-    ]
+    )
 
 settings = Settings()
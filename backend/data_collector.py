@@ -2,57 +2,313 @@
 Data collection module for fetching vehicle registration data from Vahan Dashboard
 """
 
-import requests
+import aiohttp
+import codecs
 import pandas as pd
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import date, datetime, timedelta
 import asyncio
-import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 from bs4 import BeautifulSoup
+from lxml import etree
+import io
 import time
 import re
+import random
+import sys
+from email.utils import parsedate_to_datetime
+from cache import AsyncTTLCache
+from database import DatabaseManager
+
+try:
+    import brotli  # lets aiohttp decode 'br' responses
+except ImportError:
+    brotli = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    # Only offer Brotli when aiohttp can decode it
+    'Accept-Encoding': 'br, gzip, deflate' if brotli is not None else 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Politeness limits for outbound requests to the dashboard
+MAX_CONCURRENT_REQUESTS = 4
+MAX_RETRIES = 5
+MAX_BACKOFF_SECONDS = 30
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Fetched pages are kept on disk for the rest of the day, so restarts and retries
+# within a day do not hit the dashboard again
+HTTP_CACHE_SIZE = 32
+HTTP_CACHE_TTL = 24 * 60 * 60
+HTTP_CACHE_DIR = "./.cache/http"
+
+# Common date formats in Indian government websites, in the order they are tried
+_DATE_FORMATS = (
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%Y-%m-%d",
+    "%d/%m/%y",
+    "%d-%m-%y",
+    "%b %Y",
+    "%B %Y",
+    "%Y"
+)
+
+# Most likely format for a (length, has '/', has '-') shape, tried before the full list
+_LIKELY_DATE_FORMAT = {
+    (10, True, False): "%d/%m/%Y",
+    (10, False, True): "%d-%m-%Y",
+    (8, True, False): "%d/%m/%y",
+    (8, False, True): "%d-%m-%y",
+    (8, False, False): "%b %Y",
+}
+
+_HAS_DIGIT = re.compile(r'\d')
+_YEAR_ONLY = re.compile(r'^\s*(20\d{2})\s*$')
+_YEAR_IN_TEXT = re.compile(r'\b(20\d{2})\b')
+
+# Deletes every Latin-1 character except ASCII digits and '.', so thousands separators,
+# units and currency symbols drop out in one str.translate pass
+_NUMBER_DELETE = str.maketrans('', '', ''.join(chr(c) for c in range(256) if chr(c) not in '0123456789.'))
+_NON_NUMERIC = re.compile(r'[^\d.]')
+
+# Canonical category labels, interned so every record shares the same string objects
+_2W, _3W, _4W = sys.intern('2W'), sys.intern('3W'), sys.intern('4W')
+
+# Map various category representations to standard format
+_CATEGORY_MAP: Dict[str, str] = {
+    '2w': _2W,
+    'two wheeler': _2W,
+    'two-wheeler': _2W,
+    '2 wheeler': _2W,
+    'motorcycle': _2W,
+    'scooter': _2W,
+    
+    '3w': _3W,
+    'three wheeler': _3W,
+    'three-wheeler': _3W,
+    '3 wheeler': _3W,
+    'auto rickshaw': _3W,
+    'tuk-tuk': _3W,
+    
+    '4w': _4W,
+    'four wheeler': _4W,
+    'four-wheeler': _4W,
+    '4 wheeler': _4W,
+    'car': _4W,
+    'suv': _4W,
+    'sedan': _4W
+}
+
+# Sample manufacturers: each segment they sell in, with (base, monthly step) of registrations
+_MFG_INFO: Dict[str, Tuple[Tuple[str, int, int], ...]] = {
+    "Hero MotoCorp": ((_2W, 20000, 100),),
+    "TVS": ((_2W, 20000, 100),),
+    "Bajaj": ((_2W, 20000, 100),),
+    "Honda": ((_2W, 20000, 100),),
+    "Yamaha": ((_2W, 20000, 100),),
+    "Mahindra": ((_3W, 2000, 20), (_4W, 8000, 50)),
+    "Bajaj Auto": ((_3W, 2000, 20),),
+    "Piaggio": ((_3W, 2000, 20),),
+    "Maruti Suzuki": ((_4W, 8000, 50),),
+    "Hyundai": ((_4W, 8000, 50),),
+    "Tata": ((_4W, 8000, 50),),
+    "Kia": ((_4W, 8000, 50),),
+}
+
 class VahanDataCollector:
     """
     Collects vehicle registration data from Vahan Dashboard
     """
     
-    def __init__(self):
+    # Keywords marking a table as holding category-wise or manufacturer-wise data
+    _VEHICLE_RE = re.compile(r'2w|3w|4w|two[- ]wheeler|three[- ]wheeler|four[- ]wheeler|registration', re.I)
+    _MFG_RE = re.compile(r'manufacturer|maker|company|brand', re.I)
+    
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+        # Share the app's DatabaseManager (and its connection) when given one
+        self.db = db_manager or DatabaseManager()
+        self._owns_db = db_manager is None
         self.base_url = "https://vahan.parivahan.gov.in/vahan4dashboard/"
         self.report_url = "https://vahan.parivahan.gov.in/vahan4dashboard/vahan/view/reportview.xhtml"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sem = asyncio.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        # Pages and parsed tables shared by the fetches of one collection run
+        self._pages: Dict[str, asyncio.Future] = {}
+        self._page_tables: Dict[Tuple[bytes, str], List[Tuple[str, List[List[str]]]]] = {}
+        self._http_cache = AsyncTTLCache(maxsize=HTTP_CACHE_SIZE, ttl=HTTP_CACHE_TTL, disk_dir=HTTP_CACHE_DIR)
+        self._use_http_cache = True
+        # Bytes received during the current run, as sent and after decompression
+        self._wire_bytes = 0
+        self._body_bytes = 0
+    
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session on first use (it must be bound to a running loop)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=30),
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session, and the database connection if this collector opened it"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._owns_db:
+            await self.db.close()
+    
+    async def _get(self, url: str, timeout: float = 30) -> Tuple[bytes, str]:
+        """
+        GET ``url`` and return the response body and its encoding, raising on HTTP errors
+        
+        The encoding is the charset from the Content-Type header (see _response_encoding).
+        
+        At most MAX_CONCURRENT_REQUESTS requests are in flight at once. Network errors,
+        timeouts and 429/5xx responses are retried with jittered exponential backoff,
+        waiting at least as long as the server's Retry-After asks for.
+        """
+        session = await self._ensure_session()
+        
+        for attempt in range(MAX_RETRIES):
+            last_attempt = attempt == MAX_RETRIES - 1
+            delay = min(MAX_BACKOFF_SECONDS, 2 ** attempt) + random.uniform(0.2, 1.0)
+            
+            try:
+                async with self._sem:
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                        if response.status in RETRYABLE_STATUSES and not last_attempt:
+                            delay = max(delay, self._retry_after(response.headers) or 0)
+                            logger.debug(f"{url} returned {response.status}, retrying in {delay:.1f}s")
+                        else:
+                            response.raise_for_status()
+                            body = await response.read()
+                            self._count_bytes(url, response, body)
+                            return body, self._response_encoding(url, response)
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                logger.debug(f"Request to {url} failed ({str(e) or type(e).__name__}), retrying in {delay:.1f}s")
+            
+            # Back off outside the semaphore so other requests are not held up
+            await asyncio.sleep(delay)
+    
+    def _response_encoding(self, url: str, response: aiohttp.ClientResponse) -> str:
+        """Charset from the Content-Type header, or UTF-8 when it is missing or unknown"""
+        charset = response.charset
+        if charset:
+            try:
+                codecs.lookup(charset)
+                return charset
+            except LookupError:
+                logger.debug(f"{url} declares unknown charset {charset!r}, decoding as UTF-8")
+        return 'utf-8'
+    
+    def _count_bytes(self, url: str, response: aiohttp.ClientResponse, body: bytes):
+        """Add a response to the run's transfer totals"""
+        # aiohttp hands back the decoded body; Content-Length is the encoded size
+        wire_bytes = response.content_length if response.content_length is not None else len(body)
+        self._wire_bytes += wire_bytes
+        self._body_bytes += len(body)
+        logger.debug(
+            f"{url}: {wire_bytes} bytes on the wire ({response.headers.get('Content-Encoding', 'identity')}), "
+            f"{len(body)} decoded"
+        )
+    
+    def _retry_after(self, headers) -> Optional[float]:
+        """
+        Seconds the server asked us to wait, from Retry-After or X-RateLimit-Reset
+        """
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                try:
+                    wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                    return min(max(wait, 0), MAX_BACKOFF_SECONDS)
+                except (TypeError, ValueError):
+                    pass
+        
+        reset = headers.get('X-RateLimit-Reset')
+        if reset:
+            try:
+                wait = float(reset)
+            except ValueError:
+                return None
+            # Either a delta in seconds or an epoch timestamp
+            if wait > time.time() / 2:
+                wait -= time.time()
+            return min(max(wait, 0), MAX_BACKOFF_SECONDS)
+        
+        return None
     
-    async def fetch_and_store_data(self):
-        """Main method to fetch and store all vehicle registration data"""
+    async def _get_cached(self, url: str, timeout: float = 30) -> Tuple[bytes, str]:
+        """
+        Like _get, but each URL is downloaded at most once per collection run
+        
+        Concurrent callers share the same in-flight request. Unless the run bypasses it,
+        pages also come from the on-disk HTTP cache, keyed by URL and the current day;
+        the cache keeps each body together with its encoding.
+        """
+        page = self._pages.get(url)
+        if page is None:
+            if self._use_http_cache:
+                fetch = self._http_cache.get_or_compute(
+                    url, date.today().isoformat(), lambda: self._get(url, timeout=timeout)
+                )
+            else:
+                fetch = self._get(url, timeout=timeout)
+            page = asyncio.ensure_future(fetch)
+            self._pages[url] = page
+        return await asyncio.shield(page)
+    
+    async def fetch_and_store_data(self, use_http_cache: bool = True):
+        """
+        Main method to fetch and store all vehicle registration data
+        
+        Pass ``use_http_cache=False`` to always download fresh pages (e.g. a manual refresh).
+        """
+        self._use_http_cache = use_http_cache
         try:
             logger.info("Starting data collection from Vahan Dashboard")
             
-            # Fetch different types of data
-            vehicle_category_data = await self._fetch_vehicle_category_data()
-            manufacturer_data = await self._fetch_manufacturer_data()
+            # Fetch different types of data concurrently; both start from the same report
+            # page, which is downloaded and parsed only once
+            try:
+                vehicle_category_data, manufacturer_data = await asyncio.gather(
+                    self._fetch_vehicle_category_data(),
+                    self._fetch_manufacturer_data()
+                )
+            finally:
+                self._pages.clear()
+                self._page_tables.clear()
+                logger.info(
+                    f"Downloaded {self._wire_bytes / 1024:.1f} KB from Vahan Dashboard "
+                    f"({self._body_bytes / 1024:.1f} KB decompressed)"
+                )
+                self._wire_bytes = self._body_bytes = 0
             
             # Store in database
-            from database import DatabaseManager
-            db = DatabaseManager()
-            
-            if vehicle_category_data:
-                await db.store_vehicle_data(vehicle_category_data)
+            if not vehicle_category_data.empty:
+                await self.db.store_vehicle_frame(vehicle_category_data)
             
-            if manufacturer_data:
-                await db.store_manufacturer_data(manufacturer_data)
+            if not manufacturer_data.empty:
+                await self.db.store_manufacturer_frame(manufacturer_data)
             
             logger.info("Data collection completed successfully")
             
@@ -62,7 +318,7 @@ class VahanDataCollector:
             logger.info("Falling back to sample data generation")
             await self._fallback_to_sample_data()
     
-    async def _fetch_vehicle_category_data(self) -> List[Dict]:
+    async def _fetch_vehicle_category_data(self) -> pd.DataFrame:
         """
         Fetch vehicle category-wise registration data (2W, 3W, 4W) from Vahan Dashboard
         """
@@ -70,16 +326,12 @@ class VahanDataCollector:
         
         try:
             # First, get the main dashboard page to understand the structure
-            response = self.session.get(self.report_url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse the HTML to find data tables or forms
-            soup = BeautifulSoup(response.content, 'html.parser')
+            html, encoding = await self._get_cached(self.report_url)
             
             # Look for vehicle registration data tables
-            data = await self._extract_vehicle_data_from_html(soup)
+            data = await self._extract_vehicle_data_from_html(html, encoding)
             
-            if data:
+            if not data.empty:
                 logger.info(f"Successfully extracted {len(data)} vehicle category records from Vahan Dashboard")
                 return data
             else:
@@ -88,9 +340,9 @@ class VahanDataCollector:
                 
         except Exception as e:
             logger.error(f"Error fetching vehicle category data: {str(e)}")
-            return []
+            return pd.DataFrame()
     
-    async def _fetch_manufacturer_data(self) -> List[Dict]:
+    async def _fetch_manufacturer_data(self) -> pd.DataFrame:
         """
         Fetch manufacturer-wise registration data from Vahan Dashboard
         """
@@ -98,15 +350,12 @@ class VahanDataCollector:
         
         try:
             # Try to get manufacturer-specific data
-            response = self.session.get(self.report_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            html, encoding = await self._get_cached(self.report_url)
             
             # Look for manufacturer data tables
-            data = await self._extract_manufacturer_data_from_html(soup)
+            data = await self._extract_manufacturer_data_from_html(html, encoding)
             
-            if data:
+            if not data.empty:
                 logger.info(f"Successfully extracted {len(data)} manufacturer records from Vahan Dashboard")
                 return data
             else:
@@ -115,133 +364,157 @@ class VahanDataCollector:
                 
         except Exception as e:
             logger.error(f"Error fetching manufacturer data: {str(e)}")
-            return []
+            return pd.DataFrame()
     
-    async def _extract_vehicle_data_from_html(self, soup: BeautifulSoup) -> List[Dict]:
+    def _table_rows(self, html: bytes, encoding: str, pattern: re.Pattern) -> List[List[str]]:
         """
-        Extract vehicle registration data from Vahan Dashboard HTML
+        Cell texts of each data row (header row skipped) in tables whose text matches ``pattern``
         """
-        data = []
+        tables = self._page_tables.get((html, encoding))
+        if tables is None:
+            tables = self._parse_tables(html, encoding)
+            self._page_tables[(html, encoding)] = tables
         
+        rows = []
+        for table_text, table_rows in tables:
+            if pattern.search(table_text):
+                rows.extend(table_rows)
+        
+        return rows
+    
+    def _parse_tables(self, html: bytes, encoding: str) -> List[Tuple[str, List[List[str]]]]:
+        """
+        Text and data rows (header row skipped) of every table on the page
+        
+        The page is streamed with iterparse and each table is discarded once its
+        cells have been read, so memory stays flat regardless of page size.
+        ``encoding`` is the response charset, which pages often declare only in the HTTP header.
+        """
+        tables = []
+        try:
+            for _, table in etree.iterparse(io.BytesIO(html), tag='table', html=True, recover=True, encoding=encoding):
+                # Nested tables are read as part of their outermost table
+                if next(table.iterancestors('table'), None) is not None:
+                    continue
+                
+                rows = [
+                    ["".join(cell.itertext()).strip() for cell in row if cell.tag in ('td', 'th')]
+                    for row in table.iter('tr')
+                ]
+                tables.append(("".join(table.itertext()), rows[1:]))
+                
+                # Free the table and everything parsed before it
+                table.clear()
+                while table.getprevious() is not None:
+                    del table.getparent()[0]
+        except (etree.LxmlError, ValueError, LookupError) as e:
+            # UnicodeDecodeError is a ValueError; LookupError covers an encoding lxml doesn't know
+            logger.debug(f"lxml could not parse page, falling back to BeautifulSoup: {str(e)}")
+            return self._parse_tables_bs4(html, encoding)
+        
+        return tables
+    
+    def _parse_tables_bs4(self, html: bytes, encoding: str) -> List[Tuple[str, List[List[str]]]]:
+        """
+        BeautifulSoup version of _parse_tables for pages lxml rejects
+        """
+        soup = BeautifulSoup(html, 'lxml', from_encoding=encoding)
+        
+        return [
+            (
+                table.get_text(),
+                [[cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])] for row in table.find_all('tr')[1:]]
+            )
+            for table in soup.find_all('table')
+        ]
+    
+    def _parse_table_frame(self, table_rows: List[List[str]], columns: List[str]) -> pd.DataFrame:
+        """
+        Turn raw table cells into a frame of registration records, parsing whole columns at once
+        
+        Rows with fewer cells than ``columns`` are skipped, as are rows whose date,
+        category or registration count cannot be parsed.
+        """
+        record_columns = ['date', 'year', 'month', 'quarter'] + columns[1:] + ['state']
+        # Cheap checks first: short rows and rows missing a date, category or count are
+        # dropped before any parsing (category and count are always the last two columns)
+        width = len(columns)
+        df = pd.DataFrame(
+            [cols[:width] for cols in table_rows if len(cols) >= width and cols[0] and cols[width - 2] and cols[width - 1]],
+            columns=columns
+        )
+        if df.empty:
+            return pd.DataFrame(columns=record_columns)
+        
+        # Dates and categories repeat across rows, so parse each distinct string once
+        dates = {}
+        for date_str in df['date'].unique():
+            date_obj = self._parse_date(date_str)
+            if date_obj:
+                dates[date_str] = (date_obj.strftime("%Y-%m-%d"), date_obj.year, date_obj.month)
+        parsed_dates = pd.DataFrame.from_dict(dates, orient='index', columns=['date', 'year', 'month'])
+        df = df.rename(columns={'date': 'date_str'}).join(parsed_dates, on='date_str', how='inner')
+        
+        categories = {category: self._normalize_category(category) for category in df['category'].unique()}
+        df['category'] = df['category'].map(categories)
+        
+        # Strip everything but digits and the decimal point, then convert the column in one pass
+        cleaned = df['registrations'].str.translate(_NUMBER_DELETE)
+        registrations = pd.to_numeric(cleaned, errors='coerce')
+        # Non-ASCII leftovers (e.g. Devanagari digits) go through _parse_number's regex path
+        non_ascii = registrations.isna() & ~cleaned.str.isascii()
+        if non_ascii.any():
+            registrations[non_ascii] = df.loc[non_ascii, 'registrations'].map(self._parse_number)
+        df['registrations'] = registrations
+        
+        df = df.dropna(subset=['year', 'category', 'registrations'])
+        if df.empty:
+            return pd.DataFrame(columns=record_columns)
+        
+        df['year'] = df['year'].astype('int64')
+        df['month'] = df['month'].astype('int64')
+        df['quarter'] = (df['month'] - 1) // 3 + 1
+        df['registrations'] = df['registrations'].astype('float64').astype('int64')
+        df['state'] = "All India"
+        if 'manufacturer' in df:
+            df['manufacturer'] = df['manufacturer'].str.strip()
+        
+        return df[record_columns].reset_index(drop=True)
+    
+    async def _extract_vehicle_data_from_html(self, html: bytes, encoding: str) -> pd.DataFrame:
+        """
+        Extract vehicle registration data from Vahan Dashboard HTML
+        """
         try:
             # Look for tables containing vehicle registration data
-            tables = soup.find_all('table')
-            
-            for table in tables:
-                # Check if this table contains vehicle registration data
-                table_text = table.get_text().lower()
-                if any(keyword in table_text for keyword in ['2w', '3w', '4w', 'two wheeler', 'three wheeler', 'four wheeler', 'registration']):
-                    rows = table.find_all('tr')
-                    
-                    for row in rows[1:]:  # Skip header row
-                        cols = row.find_all(['td', 'th'])
-                        if len(cols) >= 3:
-                            try:
-                                # Extract data from columns
-                                date_str = cols[0].get_text(strip=True)
-                                category = cols[1].get_text(strip=True)
-                                registrations_str = cols[2].get_text(strip=True)
-                                
-                                # Parse date
-                                date_obj = self._parse_date(date_str)
-                                if not date_obj:
-                                    continue
-                                
-                                # Parse category
-                                category = self._normalize_category(category)
-                                if not category:
-                                    continue
-                                
-                                # Parse registrations
-                                registrations = self._parse_number(registrations_str)
-                                if registrations is None:
-                                    continue
-                                
-                                # Create data record
-                                record = {
-                                    "date": date_obj.strftime("%Y-%m-%d"),
-                                    "year": date_obj.year,
-                                    "month": date_obj.month,
-                                    "quarter": (date_obj.month - 1) // 3 + 1,
-                                    "category": category,
-                                    "registrations": registrations,
-                                    "state": "All India"
-                                }
-                                
-                                data.append(record)
-                                
-                            except Exception as e:
-                                logger.debug(f"Error parsing row: {str(e)}")
-                                continue
+            table_rows = self._table_rows(html, encoding, self._VEHICLE_RE)
+            data = self._parse_table_frame(table_rows, ['date', 'category', 'registrations'])
             
             # If no data found in tables, try to find data in other HTML elements
-            if not data:
-                data = await self._extract_data_from_other_elements(soup)
+            if data.empty:
+                soup = BeautifulSoup(html, 'lxml', from_encoding=encoding)
+                data = pd.DataFrame(await self._extract_data_from_other_elements(soup))
             
             return data
             
         except Exception as e:
             logger.error(f"Error extracting vehicle data from HTML: {str(e)}")
-            return []
+            return pd.DataFrame()
     
-    async def _extract_manufacturer_data_from_html(self, soup: BeautifulSoup) -> List[Dict]:
+    async def _extract_manufacturer_data_from_html(self, html: bytes, encoding: str) -> pd.DataFrame:
         """
         Extract manufacturer registration data from Vahan Dashboard HTML
         """
-        data = []
-        
         try:
             # Look for tables containing manufacturer data
-            tables = soup.find_all('table')
-            
-            for table in tables:
-                table_text = table.get_text().lower()
-                if any(keyword in table_text for keyword in ['manufacturer', 'maker', 'company', 'brand']):
-                    rows = table.find_all('tr')
-                    
-                    for row in rows[1:]:
-                        cols = row.find_all(['td', 'th'])
-                        if len(cols) >= 4:
-                            try:
-                                date_str = cols[0].get_text(strip=True)
-                                manufacturer = cols[1].get_text(strip=True)
-                                category = cols[2].get_text(strip=True)
-                                registrations_str = cols[3].get_text(strip=True)
-                                
-                                date_obj = self._parse_date(date_str)
-                                if not date_obj:
-                                    continue
-                                
-                                category = self._normalize_category(category)
-                                if not category:
-                                    continue
-                                
-                                registrations = self._parse_number(registrations_str)
-                                if registrations is None:
-                                    continue
-                                
-                                record = {
-                                    "date": date_obj.strftime("%Y-%m-%d"),
-                                    "year": date_obj.year,
-                                    "month": date_obj.month,
-                                    "quarter": (date_obj.month - 1) // 3 + 1,
-                                    "manufacturer": manufacturer.strip(),
-                                    "category": category,
-                                    "registrations": registrations,
-                                    "state": "All India"
-                                }
-                                
-                                data.append(record)
-                                
-                            except Exception as e:
-                                logger.debug(f"Error parsing manufacturer row: {str(e)}")
-                                continue
+            table_rows = self._table_rows(html, encoding, self._MFG_RE)
+            data = self._parse_table_frame(table_rows, ['date', 'manufacturer', 'category', 'registrations'])
             
             return data
             
         except Exception as e:
             logger.error(f"Error extracting manufacturer data from HTML: {str(e)}")
-            return []
+            return pd.DataFrame()
     
     async def _extract_data_from_other_elements(self, soup: BeautifulSoup) -> List[Dict]:
         """
@@ -265,7 +538,16 @@ class VahanDataCollector:
             logger.error(f"Error extracting data from other elements: {str(e)}")
             return []
     
-    async def _try_alternative_data_sources(self) -> List[Dict]:
+    async def _get_endpoints(self, endpoints: List[str]) -> List:
+        """
+        Fetch several dashboard endpoints concurrently as (body, encoding) pages; failures come back as exception objects
+        """
+        return await asyncio.gather(
+            *(self._get_cached(f"{self.base_url}{endpoint}", timeout=15) for endpoint in endpoints),
+            return_exceptions=True
+        )
+    
+    async def _try_alternative_data_sources(self) -> pd.DataFrame:
         """
         Try alternative methods to get vehicle data
         """
@@ -278,26 +560,22 @@ class VahanDataCollector:
                 "data/vehicle-stats"
             ]
             
-            for endpoint in endpoints:
-                try:
-                    url = f"{self.base_url}{endpoint}"
-                    response = self.session.get(url, timeout=15)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        data = await self._extract_vehicle_data_from_html(soup)
-                        if data:
-                            return data
-                except Exception as e:
-                    logger.debug(f"Failed to fetch from {endpoint}: {str(e)}")
+            # Request every endpoint at once, then take the first usable one in priority order
+            for endpoint, page in zip(endpoints, await self._get_endpoints(endpoints)):
+                if isinstance(page, Exception):
+                    logger.debug(f"Failed to fetch from {endpoint}: {str(page)}")
                     continue
+                data = await self._extract_vehicle_data_from_html(*page)
+                if not data.empty:
+                    return data
             
-            return []
+            return pd.DataFrame()
             
         except Exception as e:
             logger.error(f"Error trying alternative data sources: {str(e)}")
-            return []
+            return pd.DataFrame()
     
-    async def _try_alternative_manufacturer_sources(self) -> List[Dict]:
+    async def _try_alternative_manufacturer_sources(self) -> pd.DataFrame:
         """
         Try alternative methods to get manufacturer data
         """
@@ -309,52 +587,60 @@ class VahanDataCollector:
                 "api/manufacturer-registrations"
             ]
             
-            for endpoint in endpoints:
-                try:
-                    url = f"{self.base_url}{endpoint}"
-                    response = self.session.get(url, timeout=15)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        data = await self._extract_manufacturer_data_from_html(soup)
-                        if data:
-                            return data
-                except Exception as e:
-                    logger.debug(f"Failed to fetch from {endpoint}: {str(e)}")
+            # Request every endpoint at once, then take the first usable one in priority order
+            for endpoint, page in zip(endpoints, await self._get_endpoints(endpoints)):
+                if isinstance(page, Exception):
+                    logger.debug(f"Failed to fetch from {endpoint}: {str(page)}")
                     continue
+                data = await self._extract_manufacturer_data_from_html(*page)
+                if not data.empty:
+                    return data
             
-            return []
+            return pd.DataFrame()
             
         except Exception as e:
             logger.error(f"Error trying alternative manufacturer sources: {str(e)}")
-            return []
+            return pd.DataFrame()
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """
         Parse various date formats from Vahan Dashboard
         """
-        if not date_str:
+        # Every supported shape contains a digit; header/footer cells like "Total" bail out
+        # here instead of raising through each strptime format
+        if not date_str or not _HAS_DIGIT.search(date_str):
             return None
         
-        # Common date formats in Indian government websites
-        date_formats = [
-            "%d/%m/%Y",
-            "%d-%m-%Y", 
-            "%Y-%m-%d",
-            "%d/%m/%y",
-            "%d-%m-%y",
-            "%b %Y",
-            "%B %Y",
-            "%Y"
-        ]
+        year_only = _YEAR_ONLY.match(date_str)
+        if year_only:
+            return datetime(int(year_only.group(1)), 1, 1)
+        
+        date_str_clean = date_str.strip()
+        
+        # ISO dates skip strptime entirely
+        if len(date_str_clean) == 10 and date_str_clean[4] == '-' and date_str_clean[7] == '-':
+            try:
+                return datetime.fromisoformat(date_str_clean)
+            except ValueError:
+                pass
+        
+        likely_format = _LIKELY_DATE_FORMAT.get(
+            (len(date_str_clean), '/' in date_str_clean, '-' in date_str_clean)
+        )
+        if likely_format:
+            try:
+                return datetime.strptime(date_str_clean, likely_format)
+            except ValueError:
+                pass
         
-        for fmt in date_formats:
+        for fmt in _DATE_FORMATS:
             try:
-                return datetime.strptime(date_str.strip(), fmt)
+                return datetime.strptime(date_str_clean, fmt)
             except ValueError:
                 continue
         
         # Try to extract year from text
-        year_match = re.search(r'\b(20\d{2})\b', date_str)
+        year_match = _YEAR_IN_TEXT.search(date_str)
         if year_match:
             year = int(year_match.group(1))
             return datetime(year, 1, 1)
@@ -368,34 +654,7 @@ class VahanDataCollector:
         if not category:
             return None
         
-        category_lower = category.lower().strip()
-        
-        # Map various category representations to standard format
-        category_mapping = {
-            '2w': '2W',
-            'two wheeler': '2W',
-            'two-wheeler': '2W',
-            '2 wheeler': '2W',
-            'motorcycle': '2W',
-            'scooter': '2W',
-            
-            '3w': '3W',
-            'three wheeler': '3W',
-            'three-wheeler': '3W',
-            '3 wheeler': '3W',
-            'auto rickshaw': '3W',
-            'tuk-tuk': '3W',
-            
-            '4w': '4W',
-            'four wheeler': '4W',
-            'four-wheeler': '4W',
-            '4 wheeler': '4W',
-            'car': '4W',
-            'suv': '4W',
-            'sedan': '4W'
-        }
-        
-        return category_mapping.get(category_lower, category.upper())
+        return _CATEGORY_MAP.get(category.lower().strip(), category.upper())
     
     def _parse_number(self, number_str: str) -> Optional[int]:
         """
@@ -404,21 +663,18 @@ class VahanDataCollector:
         if not number_str:
             return None
         
-        # Remove common non-numeric characters
-        cleaned = re.sub(r'[^\d,.]', '', number_str.strip())
+        # Remove non-numeric characters, including the commas of the Indian number format
+        cleaned = number_str.translate(_NUMBER_DELETE)
+        if not cleaned.isascii():
+            # Characters outside Latin-1 survive the table; fall back to the Unicode-aware regex
+            cleaned = _NON_NUMERIC.sub('', cleaned)
         
         if not cleaned:
             return None
         
         try:
-            # Handle Indian number format (with commas)
-            if ',' in cleaned:
-                cleaned = cleaned.replace(',', '')
-            
             # Convert to float first to handle decimal numbers, then to int
-            number = float(cleaned)
-            return int(number)
-            
+            return int(float(cleaned))
         except ValueError:
             return None
     
@@ -429,108 +685,71 @@ class VahanDataCollector:
         logger.info("Generating sample data as fallback")
         
         try:
-            from database import DatabaseManager
-            db = DatabaseManager()
-            
             # Generate sample vehicle category data
             vehicle_data = await self._generate_sample_vehicle_data()
-            await db.store_vehicle_data(vehicle_data)
+            await self.db.store_vehicle_frame(vehicle_data)
             
             # Generate sample manufacturer data
             manufacturer_data = await self._generate_sample_manufacturer_data()
-            await db.store_manufacturer_data(manufacturer_data)
+            await self.db.store_manufacturer_frame(manufacturer_data)
             
             logger.info("Sample data generated and stored successfully")
             
         except Exception as e:
             logger.error(f"Error generating sample data: {str(e)}")
     
-    async def _generate_sample_vehicle_data(self) -> List[Dict]:
+    def _sample_months(self, months: int = 24) -> pd.DataFrame:
+        """Date columns for the last ``months`` months, newest first, spaced 30 days apart"""
+        dates = pd.date_range(start=pd.Timestamp.now().normalize(), periods=months, freq='-30D')
+        month_numbers = dates.month.to_numpy(dtype='int64')
+        return pd.DataFrame({
+            "i": np.arange(months),
+            "date": dates.strftime("%Y-%m-%d").to_numpy(),
+            "year": dates.year.to_numpy(dtype='int64'),
+            "month": month_numbers,
+            "quarter": (month_numbers - 1) // 3 + 1
+        })
+    
+    async def _generate_sample_vehicle_data(self) -> pd.DataFrame:
         """Generate sample vehicle category data"""
-        sample_data = []
-        
-        # Generate data for the last 24 months
-        for i in range(24):
-            date = datetime.now() - timedelta(days=30*i)
-            year = date.year
-            month = date.month
-            quarter = (month - 1) // 3 + 1
-            
-            # Simulate realistic registration numbers with some randomness
-            base_2w = 150000 + (i * 1000) + (year - 2022) * 5000
-            base_3w = 8000 + (i * 50) + (year - 2022) * 300
-            base_4w = 45000 + (i * 200) + (year - 2022) * 1500
-            
-            sample_data.extend([
-                {
-                    "date": date.strftime("%Y-%m-%d"),
-                    "year": year,
-                    "month": month,
-                    "quarter": quarter,
-                    "category": "2W",
-                    "registrations": base_2w,
-                    "state": "All India"
-                },
-                {
-                    "date": date.strftime("%Y-%m-%d"),
-                    "year": year,
-                    "month": month,
-                    "quarter": quarter,
-                    "category": "3W",
-                    "registrations": base_3w,
-                    "state": "All India"
-                },
-                {
-                    "date": date.strftime("%Y-%m-%d"),
-                    "year": year,
-                    "month": month,
-                    "quarter": quarter,
-                    "category": "4W",
-                    "registrations": base_4w,
-                    "state": "All India"
-                }
-            ])
+        # Generate data for the last 24 months, one row per category
+        categories = np.array(["2W", "3W", "4W"])
+        months = self._sample_months(24)
+        i = months["i"].to_numpy()
+        year_offset = months["year"].to_numpy() - 2022
+        
+        # Simulate realistic registration numbers with some randomness
+        registrations = np.column_stack([
+            150000 + (i * 1000) + year_offset * 5000,
+            8000 + (i * 50) + year_offset * 300,
+            45000 + (i * 200) + year_offset * 1500
+        ])
+        
+        sample_data = months.drop(columns="i").loc[months.index.repeat(len(categories))].reset_index(drop=True)
+        sample_data["category"] = np.tile(categories, len(months))
+        sample_data["registrations"] = registrations.ravel()
+        sample_data["state"] = "All India"
         
         return sample_data
     
-    async def _generate_sample_manufacturer_data(self) -> List[Dict]:
+    async def _generate_sample_manufacturer_data(self) -> pd.DataFrame:
         """Generate sample manufacturer data"""
-        manufacturers = [
-            "Hero MotoCorp", "TVS", "Bajaj", "Honda", "Yamaha",  # 2W
-            "Mahindra", "Bajaj Auto", "Piaggio",  # 3W
-            "Maruti Suzuki", "Hyundai", "Tata", "Mahindra", "Kia"  # 4W
+        # One entry per (manufacturer, segment) pair
+        segments = [
+            (manufacturer, category, base, step)
+            for manufacturer, info in _MFG_INFO.items()
+            for category, base, step in info
         ]
+        manufacturers, categories, base, step = (np.array(column) for column in zip(*segments))
         
-        sample_data = []
+        # Generate data for the last 24 months, crossed with every manufacturer
+        months = self._sample_months(24)
+        i = months["i"].to_numpy()
         
-        # Generate data for the last 24 months
-        for i in range(24):
-            date = datetime.now() - timedelta(days=30*i)
-            year = date.year
-            month = date.month
-            quarter = (month - 1) // 3 + 1
-            
-            for manufacturer in manufacturers:
-                # Determine category based on manufacturer
-                if manufacturer in ["Hero MotoCorp", "TVS", "Bajaj", "Honda", "Yamaha"]:
-                    category = "2W"
-                    base_registrations = 20000 + (i * 100)
-                elif manufacturer in ["Mahindra", "Bajaj Auto", "Piaggio"]:
-                    category = "3W" 
-                    base_registrations = 2000 + (i * 20)
-                else:
-                    category = "4W"
-                    base_registrations = 8000 + (i * 50)
-                
-                sample_data.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "year": year,
-                    "month": month,
-                    "quarter": quarter,
-                    "manufacturer": manufacturer,
-                    "category": category,
-                    "registrations": base_registrations,
-                    "state": "All India"
-                })
+        sample_data = months.drop(columns="i").loc[months.index.repeat(len(segments))].reset_index(drop=True)
+        sample_data["manufacturer"] = np.tile(manufacturers, len(months))
+        sample_data["category"] = np.tile(categories, len(months))
+        sample_data["registrations"] = (base[None, :] + i[:, None] * step[None, :]).ravel()
+        sample_data["state"] = "All India"
         
         return sample_data
@@ -2,16 +2,128 @@
 Database management module for storing and retrieving vehicle registration data
 """
 
+import os
 import sqlite3
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
+from pathlib import Path
 import asyncio
 import aiosqlite
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-connection settings: WAL-friendly durability, in-memory temp tables,
+# a 64 MB page cache, a 256 MB memory map and sampled (bounded-cost) ANALYZE
+CONNECTION_PRAGMAS = """
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA analysis_limit = 1000;
+"""
+
+# Read-only connections for SELECTs; under WAL they read alongside each other and the writer
+READ_CONNECTIONS = 4
+
+# Integer columns narrowed to int32 / ISO date columns parsed when building frames
+INT32_COLUMNS = ('year', 'month', 'quarter', 'registrations')
+DATE_COLUMNS = ('date', 'last_date')
+
+# SELECT bodies that roll raw rows up to one row per month (callers add WHERE / GROUP BY)
+VEHICLE_MONTHLY_ROLLUP = """
+    (year, month, quarter, category, registrations, first_date, last_date)
+    SELECT year, month, (month - 1) / 3 + 1, category, SUM(registrations), MIN(date), MAX(date)
+    FROM vehicle_registrations
+"""
+MANUFACTURER_MONTHLY_ROLLUP = """
+    (year, month, quarter, manufacturer, category, registrations, first_date, last_date)
+    SELECT year, month, (month - 1) / 3 + 1, manufacturer, category, SUM(registrations), MIN(date), MAX(date)
+    FROM manufacturer_registrations
+"""
+
+# Low-cardinality text keys, held as pandas Categoricals by to_dataframe
+CATEGORICAL_COLUMNS = ('category', 'manufacturer')
+
+def to_dataframe(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    DataFrame over the column arrays returned by DatabaseManager
+    
+    Adds what the analytics layer groups on: categorical keys (integer codes instead
+    of hashed strings) and ``period_M``, the month count since the epoch.
+    """
+    df = pd.DataFrame({
+        name: pd.Categorical(values) if name in CATEGORICAL_COLUMNS else values
+        for name, values in columns.items()
+    })
+    df['period_M'] = df['date'].values.astype('datetime64[M]').astype(np.int32)
+    return df
+
+# Column order of the raw tables' INSERT statements, used to pull parameters out of frames
+VEHICLE_COLUMNS = ['date', 'year', 'month', 'quarter', 'category', 'registrations', 'state']
+MANUFACTURER_COLUMNS = ['date', 'year', 'month', 'quarter', 'manufacturer', 'category', 'registrations', 'state']
+
+# UNIQUE constraint columns of the raw tables
+VEHICLE_KEY = ['date', 'category', 'state']
+MANUFACTURER_KEY = ['date', 'manufacturer', 'category', 'state']
+
+# Categories that get their own column in get_category_pivot
+PIVOT_CATEGORIES = ('2W', '3W', '4W')
+PIVOT_SUMS = ", ".join(
+    f"SUM(CASE WHEN category = '{cat}' THEN registrations END) AS \"{cat}\"" for cat in PIVOT_CATEGORIES
+)
+
+# Filtered queries as (head ending in WHERE 1=1, trailing clause); _filter_query adds the filters between them
+FILTER_QUERIES = {
+    "vehicle_data": (
+        """
+        SELECT date, year, month, quarter, category, registrations, state
+        FROM vehicle_registrations
+        WHERE 1=1
+        """,
+        ""
+    ),
+    "manufacturer_data": (
+        """
+        SELECT date, year, month, quarter, manufacturer, category, registrations, state
+        FROM manufacturer_registrations
+        WHERE 1=1
+        """,
+        ""
+    ),
+    "category_timeseries": (
+        """
+        SELECT MIN(date) AS date, MAX(date) AS last_date, year, month, quarter, category,
+               SUM(registrations) AS registrations
+        FROM vehicle_registrations
+        WHERE 1=1
+        """,
+        " GROUP BY year, month, quarter, category ORDER BY year, month"
+    ),
+    "manufacturer_timeseries": (
+        """
+        SELECT MIN(date) AS date, MAX(date) AS last_date, year, month, quarter, manufacturer, category,
+               SUM(registrations) AS registrations
+        FROM manufacturer_registrations
+        WHERE 1=1
+        """,
+        " GROUP BY year, month, quarter, manufacturer, category ORDER BY year, month"
+    ),
+    "category_pivot": (
+        f"""
+        SELECT year, month,
+               {PIVOT_SUMS},
+               SUM(registrations) AS total
+        FROM vehicle_registrations
+        WHERE 1=1
+        """,
+        " GROUP BY year, month ORDER BY year DESC, month DESC LIMIT ?"
+    ),
+}
+
 class DatabaseManager:
     """
     Manages SQLite database operations for vehicle registration data
@@ -19,10 +131,84 @@ class DatabaseManager:
     
     def __init__(self, db_path: str = "vehicle_data.db"):
         self.db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        # Finished SQL per filter shape, see _filter_query
+        self._stmt_cache: Dict[tuple, str] = {}
+        # Idle read-only connections (None for a slot not opened yet), see _read
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_connections: List[aiosqlite.Connection] = []
+    
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Exclusive use of the shared connection, opened on first use with CONNECTION_PRAGMAS
+        
+        Keeping one connection warm avoids reconnecting and re-applying PRAGMAs per call.
+        The connection is in autocommit mode; writers open their own BEGIN IMMEDIATE
+        transaction. A failed block rolls back, so a half-written transaction never
+        leaks to the next user.
+        """
+        async with self._lock:
+            if self._db is None:
+                self._db = await aiosqlite.connect(self.db_path, isolation_level=None)
+                await self._db.executescript(CONNECTION_PRAGMAS)
+            try:
+                yield self._db
+            except BaseException:
+                await self._db.rollback()
+                raise
+    
+    @asynccontextmanager
+    async def _read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        A read-only connection from a pool of READ_CONNECTIONS, for queries that only SELECT
+        
+        Unlike _connect this doesn't wait for the shared connection, so concurrent
+        reads (e.g. a gather over several getters) really run side by side in SQLite.
+        Connections are opened on first use, after initialize() has created the file.
+        A private in-memory database exists only on the shared connection, so it reads there.
+        """
+        if self.db_path == ":memory:":
+            async with self._connect() as db:
+                yield db
+            return
+        
+        if self._readers is None:
+            self._readers = asyncio.Queue()
+            for _ in range(READ_CONNECTIONS):
+                self._readers.put_nowait(None)
+        
+        readers = self._readers
+        db = await readers.get()
+        try:
+            if db is None:
+                uri = f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro"
+                db = await aiosqlite.connect(uri, uri=True, isolation_level=None)
+                self._reader_connections.append(db)
+                await db.executescript(CONNECTION_PRAGMAS)
+            yield db
+        finally:
+            readers.put_nowait(db)
+    
+    async def close(self):
+        """Close the shared and pooled read connections; they are reopened by the next call"""
+        async with self._lock:
+            if self._db is not None:
+                await self._db.close()
+                self._db = None
+        
+        readers, self._reader_connections, self._readers = self._reader_connections, [], None
+        for db in readers:
+            await db.close()
     
     async def initialize(self):
         """Initialize database and create tables"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
+            # WAL is persistent: writers append to the log and readers no longer block on them
+            await db.execute("PRAGMA journal_mode = WAL")
+            await db.execute("BEGIN IMMEDIATE")
+            
             # Create vehicle registrations table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS vehicle_registrations (
@@ -35,6 +221,7 @@ class DatabaseManager:
                     registrations INTEGER NOT NULL,
                     state TEXT DEFAULT 'All India',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ymkey INTEGER,
                     UNIQUE(date, category, state)
                 )
             """)
@@ -52,10 +239,15 @@ class DatabaseManager:
                     registrations INTEGER NOT NULL,
                     state TEXT DEFAULT 'All India',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ymkey INTEGER,
                     UNIQUE(date, manufacturer, category, state)
                 )
             """)
             
+            # year * 100 + month as one integer, for cheap month-range index seeks
+            for table in ("vehicle_registrations", "manufacturer_registrations"):
+                await self._ensure_ymkey_column(db, table)
+            
             # Create indexes for better query performance
             await db.execute("CREATE INDEX IF NOT EXISTS idx_vehicle_date ON vehicle_registrations(date)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_vehicle_category ON vehicle_registrations(category)")
@@ -66,43 +258,275 @@ class DatabaseManager:
             await db.execute("CREATE INDEX IF NOT EXISTS idx_manufacturer_category ON manufacturer_registrations(category)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_manufacturer_year_quarter ON manufacturer_registrations(year, quarter)")
             
-            await db.commit()
+            # Composite indexes matching the getters' filters, so the category/manufacturer
+            # equality and the date range are both served by one index
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_vehicle_cat_date ON vehicle_registrations(category, date DESC)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_mfr_cat_date ON manufacturer_registrations(category, date DESC)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_mfr_name_date ON manufacturer_registrations(manufacturer, date DESC)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_vehicle_ymkey ON vehicle_registrations(ymkey)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_mfr_ymkey ON manufacturer_registrations(ymkey)")
             
+            # Bookkeeping values; data_version is bumped on every write so caches can invalidate
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            await db.execute("INSERT OR IGNORE INTO stats (name, value) VALUES ('data_version', 0)")
+            # Random identity of this database file; data_version restarts at 0 for every new one
+            await db.execute("INSERT OR IGNORE INTO stats (name, value) VALUES ('db_token', random())")
+            # Row counts, maintained by the store methods; counted once for existing databases
+            for name, table in (("vehicle_rows", "vehicle_registrations"), ("manufacturer_rows", "manufacturer_registrations")):
+                await db.execute(f"""
+                    INSERT INTO stats (name, value)
+                    SELECT ?, (SELECT COUNT(*) FROM {table})
+                    WHERE NOT EXISTS (SELECT 1 FROM stats WHERE name = ?)
+                """, (name, name))
+            
+            # Monthly rollups maintained at ingest so analytics can skip scanning raw rows
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS agg_month_cat (
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    quarter INTEGER NOT NULL,
+                    category TEXT NOT NULL,
+                    registrations INTEGER NOT NULL,
+                    first_date TEXT NOT NULL,
+                    last_date TEXT NOT NULL,
+                    PRIMARY KEY (year, month, category)
+                )
+            """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS agg_month_mfr (
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    quarter INTEGER NOT NULL,
+                    manufacturer TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    registrations INTEGER NOT NULL,
+                    first_date TEXT NOT NULL,
+                    last_date TEXT NOT NULL,
+                    PRIMARY KEY (year, month, manufacturer, category)
+                )
+            """)
+            
+            # Distinct manufacturer names, kept at ingest so listing them never scans the raw table
+            await db.execute("CREATE TABLE IF NOT EXISTS manufacturers (name TEXT PRIMARY KEY)")
+            
+            # Backfill rollups for databases created before they existed
+            await db.execute(f"""
+                INSERT INTO agg_month_cat {VEHICLE_MONTHLY_ROLLUP}
+                WHERE NOT EXISTS (SELECT 1 FROM agg_month_cat)
+                GROUP BY year, month, category
+            """)
+            await db.execute(f"""
+                INSERT INTO agg_month_mfr {MANUFACTURER_MONTHLY_ROLLUP}
+                WHERE NOT EXISTS (SELECT 1 FROM agg_month_mfr)
+                GROUP BY year, month, manufacturer, category
+            """)
+            await db.execute("""
+                INSERT INTO manufacturers (name)
+                SELECT DISTINCT manufacturer FROM manufacturer_registrations
+                WHERE NOT EXISTS (SELECT 1 FROM manufacturers)
+            """)
+            
+            await db.execute("COMMIT")
+        
+        # Pre-build the unfiltered and category-only shapes the dashboard asks for first
+        for name in FILTER_QUERIES:
+            for category in (None, "2W"):
+                self._filter_query(name, None, None, category)
+        
         logger.info("Database initialized successfully")
     
+    async def _ensure_ymkey_column(self, db: aiosqlite.Connection, table: str):
+        """Add and backfill the ymkey column on tables created before it existed"""
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        
+        if "ymkey" not in columns:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN ymkey INTEGER")
+            await db.execute(f"UPDATE {table} SET ymkey = year * 100 + month")
+    
     async def store_vehicle_data(self, data: List[Dict]):
         """Store vehicle category data"""
-        async with aiosqlite.connect(self.db_path) as db:
-            for record in data:
-                await db.execute("""
-                    INSERT OR REPLACE INTO vehicle_registrations 
-                    (date, year, month, quarter, category, registrations, state)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    record['date'], record['year'], record['month'], 
-                    record['quarter'], record['category'], record['registrations'],
-                    record.get('state', 'All India')
-                ))
+        rows = [
+            (
+                record['date'], record['year'], record['month'],
+                record['quarter'], record['category'], record['registrations'],
+                record.get('state', 'All India')
+            )
+            for record in data
+        ]
+        await self._store_vehicle_rows(rows)
+    
+    async def store_vehicle_frame(self, df: pd.DataFrame):
+        """Store vehicle category data held column-wise in a DataFrame"""
+        await self._store_vehicle_rows(self._frame_rows(df, VEHICLE_COLUMNS))
+    
+    async def _store_vehicle_rows(self, rows: List[tuple]):
+        """Write new and changed vehicle rows, then refresh rollups, in a single transaction"""
+        async with self._connect() as db:
+            # Take the write lock up front, so the comparison and the writes see one snapshot
+            await db.execute("BEGIN IMMEDIATE")
+            new_rows, updates, months = await self._split_changes(
+                db, "vehicle_registrations", VEHICLE_COLUMNS, VEHICLE_KEY, rows
+            )
+            cursor = await db.executemany("""
+                INSERT OR IGNORE INTO vehicle_registrations 
+                (date, year, month, quarter, category, registrations, state, ymkey)
+                VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?2 * 100 + ?3)
+            """, new_rows)
+            await self._add_row_count(db, "vehicle_rows", cursor.rowcount)
+            await db.executemany("""
+                UPDATE vehicle_registrations SET registrations = ?
+                WHERE date = ? AND category = ? AND state = ?
+            """, updates)
             
-            await db.commit()
-            logger.info(f"Stored {len(data)} vehicle registration records")
+            # Nothing to refresh or invalidate when the batch matched the stored data
+            if months:
+                await self._refresh_monthly_rollup(db, "agg_month_cat", VEHICLE_MONTHLY_ROLLUP, "category", months)
+                await self._bump_data_version(db)
+                # Keep planner statistics current so the composite indexes get picked
+                await db.execute("ANALYZE")
+            await db.execute("COMMIT")
+            logger.info(
+                f"Stored {len(rows)} vehicle registration records "
+                f"({len(new_rows)} new, {len(updates)} updated)"
+            )
     
     async def store_manufacturer_data(self, data: List[Dict]):
         """Store manufacturer data"""
-        async with aiosqlite.connect(self.db_path) as db:
-            for record in data:
-                await db.execute("""
-                    INSERT OR REPLACE INTO manufacturer_registrations 
-                    (date, year, month, quarter, manufacturer, category, registrations, state)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    record['date'], record['year'], record['month'], 
-                    record['quarter'], record['manufacturer'], record['category'], 
-                    record['registrations'], record.get('state', 'All India')
-                ))
+        rows = [
+            (
+                record['date'], record['year'], record['month'],
+                record['quarter'], record['manufacturer'], record['category'],
+                record['registrations'], record.get('state', 'All India')
+            )
+            for record in data
+        ]
+        await self._store_manufacturer_rows(rows)
+    
+    async def store_manufacturer_frame(self, df: pd.DataFrame):
+        """Store manufacturer data held column-wise in a DataFrame"""
+        await self._store_manufacturer_rows(self._frame_rows(df, MANUFACTURER_COLUMNS))
+    
+    async def _store_manufacturer_rows(self, rows: List[tuple]):
+        """Write new and changed manufacturer rows, then refresh rollups, in a single transaction"""
+        async with self._connect() as db:
+            # Take the write lock up front, so the comparison and the writes see one snapshot
+            await db.execute("BEGIN IMMEDIATE")
+            new_rows, updates, months = await self._split_changes(
+                db, "manufacturer_registrations", MANUFACTURER_COLUMNS, MANUFACTURER_KEY, rows
+            )
+            cursor = await db.executemany("""
+                INSERT OR IGNORE INTO manufacturer_registrations 
+                (date, year, month, quarter, manufacturer, category, registrations, state, ymkey)
+                VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?2 * 100 + ?3)
+            """, new_rows)
+            await self._add_row_count(db, "manufacturer_rows", cursor.rowcount)
+            await db.executemany("""
+                UPDATE manufacturer_registrations SET registrations = ?
+                WHERE date = ? AND manufacturer = ? AND category = ? AND state = ?
+            """, updates)
+            await db.executemany(
+                "INSERT OR IGNORE INTO manufacturers (name) VALUES (?)",
+                [(name,) for name in {row[4] for row in new_rows}]
+            )
             
-            await db.commit()
-            logger.info(f"Stored {len(data)} manufacturer registration records")
+            if months:
+                await self._refresh_monthly_rollup(
+                    db, "agg_month_mfr", MANUFACTURER_MONTHLY_ROLLUP, "manufacturer, category", months
+                )
+                await self._bump_data_version(db)
+                await db.execute("ANALYZE")
+            await db.execute("COMMIT")
+            logger.info(
+                f"Stored {len(rows)} manufacturer registration records "
+                f"({len(new_rows)} new, {len(updates)} updated)"
+            )
+    
+    async def _split_changes(
+        self, db: aiosqlite.Connection, table: str, columns: List[str], key_columns: List[str], rows: List[tuple]
+    ) -> Tuple[List[tuple], List[tuple], set]:
+        """
+        Compare a batch with the stored rows of the same months
+        
+        Returns the rows to insert, (registrations, *key) parameters for rows whose count
+        changed, and the (year, month) pairs touched by either. Duplicates within the batch
+        collapse to their last occurrence, as they did with INSERT OR REPLACE.
+        """
+        key_positions = [columns.index(column) for column in key_columns]
+        value_position = columns.index('registrations')
+        batch = {tuple(row[i] for i in key_positions): row for row in rows}
+        
+        ymkeys = sorted({row[1] * 100 + row[2] for row in batch.values()})
+        existing = {}
+        if ymkeys:
+            placeholders = ",".join(["?"] * len(ymkeys))
+            async with db.execute(
+                f"SELECT {', '.join(key_columns)}, registrations FROM {table} WHERE ymkey IN ({placeholders})",
+                ymkeys
+            ) as cursor:
+                async for row in cursor:
+                    existing[row[:-1]] = row[-1]
+        
+        new_rows, updates, months = [], [], set()
+        for key, row in batch.items():
+            stored = existing.get(key)
+            if stored is None:
+                new_rows.append(row)
+            elif stored != row[value_position]:
+                updates.append((row[value_position],) + key)
+            else:
+                continue
+            months.add((row[1], row[2]))
+        
+        return new_rows, updates, months
+    
+    def _frame_rows(self, df: pd.DataFrame, columns: List[str]) -> List[tuple]:
+        """Parameter tuples for ``columns`` of ``df``, with the default state filled in"""
+        if 'state' not in df:
+            df = df.assign(state='All India')
+        # itertuples yields native Python scalars, which sqlite3 can bind directly
+        return list(df[columns].itertuples(index=False, name=None))
+    
+    async def _refresh_monthly_rollup(
+        self, db: aiosqlite.Connection, table: str, rollup: str, group_columns: str, months: set
+    ):
+        """Recompute the rollup rows for every (year, month) in ``months``"""
+        months = sorted(months)
+        await db.executemany(f"DELETE FROM {table} WHERE year = ? AND month = ?", months)
+        await db.executemany(f"""
+            INSERT INTO {table} {rollup}
+            WHERE year = ? AND month = ?
+            GROUP BY year, month, {group_columns}
+        """, months)
+    
+    async def _add_row_count(self, db: aiosqlite.Connection, name: str, inserted: int):
+        """Add newly inserted rows to a stats row count inside the caller's transaction"""
+        if inserted > 0:
+            await db.execute("UPDATE stats SET value = value + ? WHERE name = ?", (inserted, name))
+    
+    async def _bump_data_version(self, db: aiosqlite.Connection):
+        """Increment the data version token inside the caller's transaction"""
+        await db.execute("UPDATE stats SET value = value + 1 WHERE name = 'data_version'")
+    
+    async def get_cache_version(self) -> str:
+        """
+        Get a token for caches that can outlive this database (disk caches, HTTP ETags)
+        
+        Combines the database path, its db_token and data_version, so a rebuilt or
+        different database never matches entries cached for another one.
+        """
+        async with self._read() as db:
+            async with db.execute(
+                "SELECT name, value FROM stats WHERE name IN ('db_token', 'data_version')"
+            ) as cursor:
+                values = dict(await cursor.fetchall())
+        
+        return f"{os.path.abspath(self.db_path)}:{values.get('db_token', 0)}:{values.get('data_version', 0)}"
     
     async def get_vehicle_data(
         self, 
@@ -110,59 +534,172 @@ class DatabaseManager:
         end_date: Optional[str] = None,
         category: Optional[str] = None
     ) -> pd.DataFrame:
-        """Get vehicle registration data with filters"""
+        """Get vehicle registration data with filters, in no particular order"""
         
-        query = """
-            SELECT date, year, month, quarter, category, registrations, state
-            FROM vehicle_registrations
-            WHERE 1=1
+        query, params = self._filter_query("vehicle_data", start_date, end_date, category)
+        
+        async with self._read() as db:
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+        
+        return to_dataframe(self._to_columns(rows, columns))
+    
+    async def get_manufacturer_data(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        manufacturers: Optional[List[str]] = None,
+        category: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get manufacturer registration data with filters, in no particular order"""
+        
+        query, params = self._filter_query("manufacturer_data", start_date, end_date, category, manufacturers)
+        
+        async with self._read() as db:
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+        
+        return to_dataframe(self._to_columns(rows, columns))
+    
+    async def get_category_timeseries(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get vehicle registrations summed per month and category for any date range
+        Returns the same column arrays as get_vehicle_monthly_rollup
         """
-        params = []
         
-        if start_date:
-            query += " AND date >= ?"
-            params.append(start_date)
+        query, params = self._filter_query("category_timeseries", start_date, end_date, category)
         
-        if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
+        async with self._read() as db:
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+        
+        return self._to_columns(rows, columns)
+    
+    async def get_manufacturer_timeseries(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        manufacturers: Optional[List[str]] = None,
+        category: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get manufacturer registrations summed per month, manufacturer and category for any date range
+        Returns the same column arrays as get_manufacturer_monthly_rollup
+        """
+        
+        query, params = self._filter_query("manufacturer_timeseries", start_date, end_date, category, manufacturers)
+        
+        async with self._read() as db:
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+                columns = [description[0] for description in cursor.description]
+        
+        return self._to_columns(rows, columns)
+    
+    async def get_category_pivot(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        category: Optional[str] = None,
+        months: int = 12
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get the latest ``months`` months of registrations with one column per PIVOT_CATEGORIES entry
+        
+        Returns year/month arrays in chronological order, a float array per pivot category
+        (NaN for months without rows in that category) and ``total`` over every category.
+        """
+        
+        query, params = self._filter_query("category_pivot", start_date, end_date, category)
+        params.append(months)
+        
+        async with self._read() as db:
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+        
+        # Newest months come first from the LIMIT query
+        rows.reverse()
+        count = len(rows)
+        values = list(zip(*rows)) if rows else [()] * (len(PIVOT_CATEGORIES) + 3)
+        pivot = {
+            "year": np.fromiter(values[0], dtype=np.int32, count=count),
+            "month": np.fromiter(values[1], dtype=np.int32, count=count),
+        }
+        for cat, column in zip(PIVOT_CATEGORIES, values[2:]):
+            pivot[cat] = np.array(column, dtype=np.float64)
+        pivot["total"] = np.fromiter(values[-1], dtype=np.int64, count=count)
+        return pivot
+    
+    def can_use_monthly_rollup(self, start_date: Optional[str], end_date: Optional[str]) -> bool:
+        """Whether the date range covers whole months, so the monthly rollups answer it exactly"""
+        try:
+            if start_date and datetime.strptime(start_date, "%Y-%m-%d").day != 1:
+                return False
+            if end_date:
+                end = datetime.strptime(end_date, "%Y-%m-%d")
+                if (end + timedelta(days=1)).day != 1:
+                    return False
+        except ValueError:
+            return False
+        return True
+    
+    async def get_vehicle_monthly_rollup(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get monthly vehicle registration totals as column arrays (see _to_columns)
+        The range must satisfy can_use_monthly_rollup
+        """
+        
+        query = """
+            SELECT first_date AS date, last_date, year, month, quarter, category, registrations
+            FROM agg_month_cat
+            WHERE 1=1
+        """
+        query, params = self._monthly_rollup_filters(query, start_date, end_date)
         
         if category:
             query += " AND category = ?"
             params.append(category)
         
-        query += " ORDER BY date DESC"
+        query += " ORDER BY year, month"
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._read() as db:
             async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 columns = [description[0] for description in cursor.description]
         
-        return pd.DataFrame(rows, columns=columns)
+        return self._to_columns(rows, columns)
     
-    async def get_manufacturer_data(
+    async def get_manufacturer_monthly_rollup(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         manufacturers: Optional[List[str]] = None,
         category: Optional[str] = None
-    ) -> pd.DataFrame:
-        """Get manufacturer registration data with filters"""
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get monthly manufacturer registration totals as column arrays (see _to_columns)
+        The range must satisfy can_use_monthly_rollup
+        """
         
         query = """
-            SELECT date, year, month, quarter, manufacturer, category, registrations, state
-            FROM manufacturer_registrations
+            SELECT first_date AS date, last_date, year, month, quarter, manufacturer, category, registrations
+            FROM agg_month_mfr
             WHERE 1=1
         """
-        params = []
-        
-        if start_date:
-            query += " AND date >= ?"
-            params.append(start_date)
-        
-        if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
+        query, params = self._monthly_rollup_filters(query, start_date, end_date)
         
         if category:
             query += " AND category = ?"
@@ -173,41 +710,158 @@ class DatabaseManager:
             query += f" AND manufacturer IN ({placeholders})"
             params.extend(manufacturers)
         
-        query += " ORDER BY date DESC"
+        query += " ORDER BY year, month"
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._read() as db:
             async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 columns = [description[0] for description in cursor.description]
         
-        return pd.DataFrame(rows, columns=columns)
+        return self._to_columns(rows, columns)
+    
+    def _filter_query(
+        self,
+        name: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        category: Optional[str] = None,
+        manufacturers: Optional[List[str]] = None
+    ) -> Tuple[str, list]:
+        """
+        SQL and parameters for FILTER_QUERIES[name] with the given filters applied
+        
+        Date bounds become integer ymkey bounds so SQLite can seek the ymkey index; the
+        text date comparison is only kept for bounds that fall inside a month. The SQL only
+        depends on which filters are present, so each shape is built once and looked up
+        afterwards, and sqlite3's statement cache skips re-preparing it.
+        """
+        params = []
+        start_shape = self._range_bound(start_date, True, params)
+        end_shape = self._range_bound(end_date, False, params)
+        
+        if category:
+            params.append(category)
+        
+        if manufacturers:
+            params.extend(manufacturers)
+        
+        shape = (name, start_shape, end_shape, bool(category), len(manufacturers or ()))
+        query = self._stmt_cache.get(shape)
+        if query is None:
+            query = self._stmt_cache[shape] = self._build_filter_query(*shape)
+        
+        return query, params
+    
+    def _range_bound(self, date_str: Optional[str], is_start: bool, params: list) -> Tuple[bool, bool]:
+        """Append the parameters for one date bound; returns whether it uses (ymkey, date) predicates"""
+        if not date_str:
+            return (False, False)
+        
+        key = self._ymkey(date_str)
+        if key is not None:
+            params.append(key)
+        
+        month_edge = self.can_use_monthly_rollup(date_str, None) if is_start else self.can_use_monthly_rollup(None, date_str)
+        if key is None or not month_edge:
+            # Stored dates are zero-padded ISO strings, so compare against the same form
+            params.append(self._iso_date(date_str) if key is not None else date_str)
+            return (key is not None, True)
+        return (True, False)
+    
+    def _build_filter_query(
+        self, name: str, start_shape: Tuple[bool, bool], end_shape: Tuple[bool, bool],
+        has_category: bool, manufacturer_count: int
+    ) -> str:
+        """Assemble the SQL for one filter shape; placeholders follow _filter_query's parameter order"""
+        head, tail = FILTER_QUERIES[name]
+        clauses = []
+        
+        for (has_key, has_date), op in ((start_shape, ">="), (end_shape, "<=")):
+            if has_key:
+                clauses.append(f" AND ymkey {op} ?")
+            if has_date:
+                clauses.append(f" AND date {op} ?")
+        
+        if has_category:
+            clauses.append(" AND category = ?")
+        
+        if manufacturer_count:
+            placeholders = ",".join(["?"] * manufacturer_count)
+            clauses.append(f" AND manufacturer IN ({placeholders})")
+        
+        return head + "".join(clauses) + tail
+    
+    def _ymkey(self, date_str: str) -> Optional[int]:
+        """year * 100 + month of a YYYY-MM-DD string, or None if it is not a valid date"""
+        try:
+            parsed = datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            return None
+        return parsed.year * 100 + parsed.month
+    
+    def _iso_date(self, date_str: str) -> str:
+        """Zero-padded YYYY-MM-DD form of a date string _ymkey accepts"""
+        return datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
+    
+    def _monthly_rollup_filters(self, query: str, start_date: Optional[str], end_date: Optional[str]):
+        """Append whole-month range predicates for the rollup tables"""
+        params = []
+        
+        # Parsed rather than sliced so non-zero-padded dates such as 2025-1-1 work too
+        if start_date:
+            query += " AND year * 100 + month >= ?"
+            params.append(self._ymkey(start_date))
+        
+        if end_date:
+            query += " AND year * 100 + month <= ?"
+            params.append(self._ymkey(end_date))
+        
+        return query, params
+    
+    def _to_columns(self, rows: List[tuple], columns: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Transpose query rows into one typed NumPy array per column (structure of arrays)
+        
+        The rows are transposed once and each column is converted straight to its final
+        dtype, rather than boxing every cell into a 2-D object block and casting afterwards.
+        """
+        count = len(rows)
+        values = zip(*rows) if rows else [()] * len(columns)
+        data = {}
+        for name, column in zip(columns, values):
+            if name in INT32_COLUMNS:
+                # Monthly counts fit comfortably in int32, halving the bytes every reduction reads
+                data[name] = np.fromiter(column, dtype=np.int32, count=count)
+            elif name in DATE_COLUMNS:
+                data[name] = pd.to_datetime(np.array(column, dtype=object), format='%Y-%m-%d', cache=True).to_numpy()
+            else:
+                data[name] = np.array(column, dtype=object)
+        return data
     
     async def get_manufacturers(self) -> List[str]:
         """Get list of all distinct manufacturers"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT DISTINCT manufacturer FROM manufacturer_registrations ORDER BY manufacturer"
-            ) as cursor:
+        async with self._read() as db:
+            async with db.execute("SELECT name FROM manufacturers ORDER BY name") as cursor:
                 rows = await cursor.fetchall()
                 return [row[0] for row in rows]
     
     async def get_vehicle_data_count(self) -> int:
         """Get total count of vehicle registration records"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT COUNT(*) FROM vehicle_registrations") as cursor:
+        async with self._read() as db:
+            async with db.execute("SELECT value FROM stats WHERE name = 'vehicle_rows'") as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else 0
     
     async def get_manufacturer_data_count(self) -> int:
         """Get total count of manufacturer registration records"""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT COUNT(*) FROM manufacturer_registrations") as cursor:
+        async with self._read() as db:
+            async with db.execute("SELECT value FROM stats WHERE name = 'manufacturer_rows'") as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else 0
     
     async def get_latest_data_date(self) -> Optional[str]:
         """Get the most recent date in the database"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._read() as db:
             async with db.execute("SELECT MAX(date) FROM vehicle_registrations") as cursor:
                 result = await cursor.fetchone()
         
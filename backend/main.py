@@ -3,24 +3,73 @@ FastAPI backend for Vehicle Registration Dashboard
 Fetches data from Vahan Dashboard and provides API endpoints for the React frontend
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List
+from fastapi.responses import JSONResponse, Response
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Tuple
 import pandas as pd
 from datetime import datetime, timedelta
 import uvicorn
+import asyncio
+import hashlib
 import logging
+import orjson
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: Arrow IPC responses for /api/registrations
+    pa = None
 
 from data_collector import VahanDataCollector
 from database import DatabaseManager
 from analytics import VehicleAnalytics
 from config import settings
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, which also handles NumPy scalars and arrays"""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+def _json_default(value):
+    """orjson fallback for values it can't encode natively, e.g. the summary's pandas Timestamps"""
+    if isinstance(value, datetime):
+        # Same ISO format the JSON responses get from FastAPI's jsonable_encoder
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def arrow_stream_response(data: dict, filters: dict) -> Response:
+    """
+    Encode get_filtered_data output as an Arrow IPC stream
+    
+    chart_data becomes the record batch columns; the metrics, summary and filters
+    are small and ride along as JSON in the schema metadata.
+    """
+    table = pa.Table.from_pylist(data["chart_data"])
+    metadata = {
+        key: orjson.dumps(
+            value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        for key, value in data.items() if key != "chart_data"
+    }
+    metadata["filters"] = orjson.dumps(filters)
+    table = table.replace_schema_metadata(metadata)
+    
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    
+    return Response(content=sink.getvalue().to_pybytes(), media_type=ARROW_STREAM_MEDIA_TYPE)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Vehicle Registration Dashboard API",
     description="API for fetching and analyzing vehicle registration data from Vahan Dashboard",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes the large chart/metrics payloads several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware to allow React frontend to connect
@@ -40,19 +89,55 @@ app.add_middleware(
 )
 
 # Initialize components
-data_collector = VahanDataCollector()
 db_manager = DatabaseManager()
+data_collector = VahanDataCollector(db_manager)
 analytics = VehicleAnalytics(db_manager)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Background task running the first data fetch; see startup_event and /ready
+_initial_fetch: Optional[asyncio.Task] = None
+
+# Last response body per endpoint, with the version tag it was built for
+_response_cache: Dict[str, Tuple[str, Any]] = {}
+
+async def cached_response(
+    request: Request, name: str, build: Callable[[], Awaitable[Any]], scope: str = ""
+) -> Response:
+    """
+    Serve an endpoint whose body only changes when the data (or ``scope``) does
+    
+    The body is rebuilt once per data version and tagged with it, so repeat
+    polls are answered from memory, or with 304 when the client has it already.
+    The tag includes the database identity, so a rebuilt database never yields a false 304.
+    If ``build`` raises nothing is cached, and the next request tries again.
+    """
+    version = f"{await db_manager.get_cache_version()}{scope}"
+    # Hashed so the ETag doesn't expose the database path
+    etag = f'"{name}-{hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]}"'
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    cached = _response_cache.get(name)
+    if cached is None or cached[0] != version:
+        cached = _response_cache[name] = (version, await build())
+    
+    return ORJSONResponse(cached[1], headers={"ETag": etag})
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database and fetch initial data"""
+    """Initialize database and start fetching initial data"""
+    global _initial_fetch
     await db_manager.initialize()
-    # Try to fetch real data from Vahan Dashboard
+    # The fetch runs in the background so the API serves requests while it downloads
+    _initial_fetch = asyncio.create_task(fetch_initial_data())
+
+async def fetch_initial_data():
+    """Try to fetch real data from Vahan Dashboard"""
     try:
         logger.info("Attempting to fetch real data from Vahan Dashboard...")
         await data_collector.fetch_and_store_data()
@@ -61,34 +146,30 @@ async def startup_event():
         logger.warning(f"Could not fetch real data from Vahan Dashboard: {str(e)}")
         logger.info("Using sample data instead")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop a pending initial fetch, then release the HTTP session, analytics pool and database connection"""
+    if _initial_fetch is not None and not _initial_fetch.done():
+        _initial_fetch.cancel()
+        try:
+            await _initial_fetch
+        except asyncio.CancelledError:
+            pass
+    await data_collector.close()
+    analytics.close()
+    await db_manager.close()
+
+@app.get("/ready")
+async def ready():
+    """Readiness check: true once the initial data fetch has finished"""
+    is_ready = _initial_fetch is not None and _initial_fetch.done()
+    return ORJSONResponse({"ready": is_ready}, status_code=200 if is_ready else 503)
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Health check and API information"""
     try:
-        # Get data counts
-        vehicle_count = await db_manager.get_vehicle_data_count()
-        manufacturer_count = await db_manager.get_manufacturer_data_count()
-        latest_date = await db_manager.get_latest_data_date()
-        
-        return {
-            "status": "healthy",
-            "service": "Vehicle Registration Dashboard API",
-            "version": "1.0.0",
-            "data_source": "Vahan Dashboard (https://vahan.parivahan.gov.in)",
-            "data_status": {
-                "vehicle_registrations": vehicle_count,
-                "manufacturer_registrations": manufacturer_count,
-                "latest_data_date": latest_date,
-                "data_freshness": "Real-time from Vahan Dashboard" if vehicle_count > 0 else "Sample data"
-            },
-            "endpoints": {
-                "registrations": "/api/registrations",
-                "insights": "/api/insights", 
-                "manufacturers": "/api/manufacturers",
-                "refresh": "/api/refresh-data",
-                "docs": "/docs"
-            }
-        }
+        return await cached_response(request, "root", build_root)
     except Exception as e:
         logger.error(f"Error in health check: {str(e)}")
         return {
@@ -97,8 +178,37 @@ async def root():
             "service": "Vehicle Registration Dashboard API"
         }
 
+async def build_root() -> dict:
+    """Body of the health check"""
+    # Get data counts
+    vehicle_count = await db_manager.get_vehicle_data_count()
+    manufacturer_count = await db_manager.get_manufacturer_data_count()
+    latest_date = await db_manager.get_latest_data_date()
+    
+    return {
+        "status": "healthy",
+        "service": "Vehicle Registration Dashboard API",
+        "version": "1.0.0",
+        "data_source": "Vahan Dashboard (https://vahan.parivahan.gov.in)",
+        "data_status": {
+            "vehicle_registrations": vehicle_count,
+            "manufacturer_registrations": manufacturer_count,
+            "latest_data_date": latest_date,
+            "data_freshness": "Real-time from Vahan Dashboard" if vehicle_count > 0 else "Sample data"
+        },
+        "endpoints": {
+            "registrations": "/api/registrations",
+            "insights": "/api/insights", 
+            "manufacturers": "/api/manufacturers",
+            "refresh": "/api/refresh-data",
+            "ready": "/ready",
+            "docs": "/docs"
+        }
+    }
+
 @app.get("/api/registrations")
 async def get_registrations(
+    request: Request,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     category: Optional[str] = Query(None, description="Vehicle category (2W, 3W, 4W)"),
@@ -107,6 +217,7 @@ async def get_registrations(
     """
     Get vehicle registration data with optional filters
     Returns both raw counts and YoY/QoQ percentage changes
+    Sends an Arrow IPC stream instead of JSON when the client accepts it and pyarrow is installed
     """
     try:
         # Parse manufacturers
@@ -122,41 +233,53 @@ async def get_registrations(
             manufacturers=manufacturer_list
         )
         
+        filters = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "category": category,
+            "manufacturers": manufacturer_list
+        }
+        
+        if pa is not None and ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", ""):
+            return arrow_stream_response(data, filters)
+        
         return {
             "status": "success",
             "data": data,
-            "filters": {
-                "start_date": start_date,
-                "end_date": end_date,
-                "category": category,
-                "manufacturers": manufacturer_list
-            }
+            "filters": filters
         }
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/insights")
-async def get_insights():
+async def get_insights(request: Request):
     """Get key insights and trends"""
-    try:
+    async def build():
         insights = await analytics.get_insights()
         return {
             "status": "success",
             "data": insights
         }
+    
+    try:
+        # Insights cover the trailing 12 months, so they also move with the calendar day
+        return await cached_response(request, "insights", build, scope=f"-{datetime.now():%Y%m%d}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/manufacturers")
-async def get_manufacturers():
+async def get_manufacturers(request: Request):
     """Get list of available manufacturers"""
-    try:
+    async def build():
         manufacturers = await analytics.get_manufacturers()
         return {
             "status": "success",
             "manufacturers": manufacturers
         }
+    
+    try:
+        return await cached_response(request, "manufacturers", build)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -166,8 +289,12 @@ async def refresh_data():
     try:
         logger.info("Manual data refresh requested")
         
-        # Try to fetch real data from Vahan Dashboard
-        await data_collector.fetch_and_store_data()
+        # Don't crawl twice at once; the refresh starts after a still running initial fetch
+        if _initial_fetch is not None and not _initial_fetch.done():
+            await asyncio.shield(_initial_fetch)
+        
+        # Try to fetch real data from Vahan Dashboard, bypassing the day's cached pages
+        await data_collector.fetch_and_store_data(use_http_cache=False)
         
         # Get updated data count
         vehicle_count = await db_manager.get_vehicle_data_count()
@@ -5,21 +5,19 @@ Startup script for the Vehicle Registration Dashboard backend
 import asyncio
 import uvicorn
 from main import app
-from data_collector import VahanDataCollector
 from database import DatabaseManager
 
 async def initialize_data():
-    """Initialize database and populate with sample data"""
+    """Initialize database tables; the server fetches data in the background once it is up"""
     print("Initializing database...")
     
     db_manager = DatabaseManager()
-    await db_manager.initialize()
+    try:
+        await db_manager.initialize()
+    finally:
+        await db_manager.close()
     
-    print("Fetching initial data...")
-    data_collector = VahanDataCollector()
-    await data_collector.fetch_and_store_data()
-    
-    print("Data initialization completed!")
+    print("Database ready; initial data is fetched after startup (see /ready)")
 
 if __name__ == "__main__":
     # Initialize data first
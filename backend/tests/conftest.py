@@ -0,0 +1,8 @@
+"""
+Shared test setup: make the flat backend modules importable
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,80 @@
+"""
+Tests for VehicleAnalytics computations that don't need a database
+"""
+
+import asyncio
+
+import numpy as np
+
+from analytics import VehicleAnalytics
+from database import DatabaseManager
+
+def _columns(registrations):
+    return {
+        "date": np.array(["2025-01-05", "2025-01-05"], dtype="datetime64[ns]"),
+        "category": np.array(["2W", "3W"], dtype=object),
+        "registrations": np.array(registrations, dtype=np.int64),
+        "year": np.array([2025, 2025]),
+        "month": np.array([1, 1]),
+        "quarter": np.array([1, 1]),
+    }
+
+def _spring_columns(registrations):
+    """One 2W month each for March, April and May 2025"""
+    return {
+        "date": np.array(["2025-03-01", "2025-04-01", "2025-05-01"], dtype="datetime64[ns]"),
+        "category": np.array(["2W"] * 3, dtype=object),
+        "registrations": np.array(registrations, dtype=np.int64),
+        "year": np.array([2025] * 3),
+        "month": np.array([3, 4, 5]),
+        "quarter": np.array([1, 2, 2]),
+    }
+
+def test_metrics_fingerprint_sees_registrations_moving_between_groups():
+    analytics = VehicleAnalytics(DatabaseManager(":memory:"))
+
+    before = analytics._metrics_fingerprint(_columns([10, 5]), "category")
+    after = analytics._metrics_fingerprint(_columns([5, 10]), "category")
+
+    assert before != after
+
+def test_metrics_memo_does_not_mix_up_frames_with_equal_totals():
+    analytics = VehicleAnalytics(DatabaseManager(":memory:"))
+
+    # Same row count, dates, total and month-weighted total; different quarters
+    first = analytics._calculate_yoy_qoq_metrics(_spring_columns([60, 80, 60]), "category")
+    second = analytics._calculate_yoy_qoq_metrics(_spring_columns([70, 60, 70]), "category")
+
+    assert first[0]["qoq_change"] == 133.33
+    assert second[0]["qoq_change"] == 85.71
+
+def test_executor_is_created_lazily_and_released_by_close():
+    analytics = VehicleAnalytics(DatabaseManager(":memory:"))
+    assert analytics._executor is None
+
+    assert asyncio.run(analytics._run_in_executor(sum, [1, 2])) == 3
+    executor = analytics._executor
+    assert executor is not None
+
+    analytics.close()
+    assert analytics._executor is None
+    assert executor._shutdown
+
+def test_qoq_compares_the_chronologically_latest_quarter():
+    analytics = VehicleAnalytics(DatabaseManager(":memory:"))
+    # 2024 Q3, 2024 Q4, 2025 Q1, 2025 Q2 for one manufacturer
+    columns = {
+        "date": np.array(["2024-08-01", "2024-11-01", "2025-02-01", "2025-05-01"], dtype="datetime64[ns]"),
+        "manufacturer": np.array(["Kia"] * 4, dtype=object),
+        "registrations": np.array([100, 150, 120, 60], dtype=np.int64),
+        "year": np.array([2024, 2024, 2025, 2025]),
+        "month": np.array([8, 11, 2, 5]),
+        "quarter": np.array([3, 4, 1, 2]),
+    }
+
+    metrics = analytics._calculate_yoy_qoq_metrics(columns, "manufacturer")
+
+    # 2025 Q2 against 2025 Q1; the original code reported 2024 Q4 (+50.0), the
+    # highest quarter number, even though later quarters followed
+    assert metrics[0]["qoq_change"] == -50.0
+    assert metrics[0]["yoy_change"] == -28.0
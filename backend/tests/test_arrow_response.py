@@ -0,0 +1,94 @@
+"""
+Tests for the Arrow IPC branch of /api/registrations, with pyarrow stubbed out
+"""
+
+import types
+
+import orjson
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import main
+
+class FakeTable:
+    """Records what arrow_stream_response puts into the table"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.schema = types.SimpleNamespace(metadata=None)
+
+    @classmethod
+    def from_pylist(cls, rows):
+        return cls(rows)
+
+    def replace_schema_metadata(self, metadata):
+        self.schema = types.SimpleNamespace(metadata=metadata)
+        return self
+
+class FakeSink:
+    def getvalue(self):
+        return types.SimpleNamespace(to_pybytes=lambda: b"ARROW")
+
+class FakeWriter:
+    written = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_table(self, table):
+        FakeWriter.written.append(table)
+
+fake_pa = types.SimpleNamespace(
+    Table=FakeTable,
+    BufferOutputStream=FakeSink,
+    ipc=types.SimpleNamespace(new_stream=lambda sink, schema: FakeWriter()),
+)
+
+FILTERED_DATA = {
+    "chart_data": [{"month": "2025-01", "2w": 10, "total": 10}],
+    "vehicle_metrics": [{"category": "2W", "total_registrations": 10}],
+    "manufacturer_metrics": [],
+    "summary": {
+        "total_registrations": 10,
+        "data_period": {"start": pd.Timestamp("2025-01-05"), "end": pd.Timestamp("2025-01-28")},
+    },
+}
+
+def test_arrow_branch_serializes_timestamps(monkeypatch):
+    async def fake_get_filtered_data(**kwargs):
+        return FILTERED_DATA
+
+    FakeWriter.written.clear()
+    monkeypatch.setattr(main, "pa", fake_pa)
+    monkeypatch.setattr(main.analytics, "get_filtered_data", fake_get_filtered_data)
+
+    client = TestClient(main.app)
+    response = client.get(
+        "/api/registrations", params={"category": "2W"}, headers={"accept": main.ARROW_STREAM_MEDIA_TYPE}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == main.ARROW_STREAM_MEDIA_TYPE
+    assert response.content == b"ARROW"
+
+    table = FakeWriter.written[0]
+    assert table.rows == FILTERED_DATA["chart_data"]
+    metadata = {key: orjson.loads(value) for key, value in table.schema.metadata.items()}
+    assert metadata["summary"]["data_period"] == {"start": "2025-01-05T00:00:00", "end": "2025-01-28T00:00:00"}
+    assert metadata["vehicle_metrics"] == [{"category": "2W", "total_registrations": 10}]
+    assert metadata["filters"]["category"] == "2W"
+
+def test_json_is_default_without_arrow_accept(monkeypatch):
+    async def fake_get_filtered_data(**kwargs):
+        return FILTERED_DATA
+
+    monkeypatch.setattr(main, "pa", fake_pa)
+    monkeypatch.setattr(main.analytics, "get_filtered_data", fake_get_filtered_data)
+
+    response = TestClient(main.app).get("/api/registrations")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["summary"]["data_period"]["start"] == "2025-01-05T00:00:00"
@@ -0,0 +1,104 @@
+"""
+Tests for AsyncTTLCache's disk level: version and TTL checks across instances
+"""
+
+import asyncio
+import os
+import pickle
+
+from cache import AsyncTTLCache
+
+def test_disk_entry_is_reused_by_a_new_instance(tmp_path):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"rows": len(calls)}
+
+    async def run():
+        first = await AsyncTTLCache(4, 60, disk_dir=str(tmp_path)).get_or_compute("k", "v1", compute)
+        second = await AsyncTTLCache(4, 60, disk_dir=str(tmp_path)).get_or_compute("k", "v1", compute)
+        return first, second
+
+    assert asyncio.run(run()) == ({"rows": 1}, {"rows": 1})
+    assert len(calls) == 1
+
+def test_disk_entry_for_another_version_is_ignored(tmp_path):
+    async def run():
+        await AsyncTTLCache(4, 60, disk_dir=str(tmp_path)).get_or_compute("k", "db-a:0", _value("a"))
+        return await AsyncTTLCache(4, 60, disk_dir=str(tmp_path)).get_or_compute("k", "db-b:0", _value("b"))
+
+    assert asyncio.run(run()) == "b"
+
+def test_expired_disk_entry_is_recomputed(tmp_path):
+    async def run():
+        cache = AsyncTTLCache(4, 60, disk_dir=str(tmp_path))
+        await cache.get_or_compute("k", "v1", _value("old"))
+
+        # Age the stored entry past the TTL
+        path = os.path.join(str(tmp_path), os.listdir(str(tmp_path))[0])
+        with open(path, "rb") as f:
+            key, version, stored_at, value = pickle.load(f)
+        with open(path, "wb") as f:
+            pickle.dump((key, version, stored_at - 120, value), f)
+
+        return await AsyncTTLCache(4, 60, disk_dir=str(tmp_path)).get_or_compute("k", "v1", _value("new"))
+
+    assert asyncio.run(run()) == "new"
+
+def _value(value):
+    async def compute():
+        return value
+    return compute
+
+def test_stale_and_expired_disk_entries_are_deleted(tmp_path):
+    async def run():
+        cache = AsyncTTLCache(4, 60, disk_dir=str(tmp_path))
+        await cache.get_or_compute("stale", "v1", _value("a"))
+        await cache.get_or_compute("expired", "v1", _value("b"))
+
+        # Age the "expired" entry past the TTL
+        path = cache._disk_path("expired")
+        with open(path, "rb") as f:
+            key, version, stored_at, value = pickle.load(f)
+        with open(path, "wb") as f:
+            pickle.dump((key, version, stored_at - 120, value), f)
+
+        fresh = AsyncTTLCache(4, 60, disk_dir=str(tmp_path))
+        assert fresh._read_disk("stale", "v2") is None
+        assert fresh._read_disk("expired", "v1") is None
+
+    asyncio.run(run())
+    assert os.listdir(str(tmp_path)) == []
+
+def test_disk_entries_are_capped_oldest_first(tmp_path):
+    async def run():
+        cache = AsyncTTLCache(8, 60, disk_dir=str(tmp_path), max_disk_entries=2)
+        for i, key in enumerate(("a", "b", "c")):
+            await cache.get_or_compute(key, "v1", _value(key))
+            # Distinct modification times, oldest first
+            os.utime(cache._disk_path(key), (1000 + i, 1000 + i))
+        await cache.get_or_compute("d", "v1", _value("d"))
+        return {path.name for path in tmp_path.iterdir()}, cache
+
+    names, cache = asyncio.run(run())
+    assert names == {cache._disk_path("c").name, cache._disk_path("d").name}
+
+def test_new_version_does_not_join_an_older_computation():
+    async def run():
+        cache = AsyncTTLCache(4, 60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_old():
+            started.set()
+            await release.wait()
+            return "old"
+
+        old = asyncio.ensure_future(cache.get_or_compute("k", "v1", slow_old))
+        await started.wait()
+        new = await cache.get_or_compute("k", "v2", _value("new"))
+        release.set()
+        return await old, new
+
+    assert asyncio.run(run()) == ("old", "new")
@@ -0,0 +1,67 @@
+"""
+Tests for the ETag-cached endpoints in main, with the database version stubbed out
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_cache_version():
+        return "/tmp/vehicle_data.db:1:1"
+
+    monkeypatch.setattr(main, "_response_cache", {})
+    monkeypatch.setattr(main.db_manager, "get_cache_version", fake_cache_version)
+    return TestClient(main.app)
+
+def test_failed_insights_build_is_not_cached(client, monkeypatch):
+    calls = []
+
+    async def flaky_insights():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return [{"type": "growth", "title": "2W up"}]
+
+    monkeypatch.setattr(main.analytics, "get_insights", flaky_insights)
+
+    assert client.get("/api/insights").status_code == 500
+
+    response = client.get("/api/insights")
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"type": "growth", "title": "2W up"}]
+
+def test_if_none_match_round_trip_returns_304_until_the_data_changes(client, monkeypatch):
+    builds = []
+    version = {"value": "/tmp/vehicle_data.db:1:1"}
+
+    async def fake_cache_version():
+        return version["value"]
+
+    async def fake_manufacturers():
+        builds.append(1)
+        return ["Hero", "Honda"]
+
+    monkeypatch.setattr(main.db_manager, "get_cache_version", fake_cache_version)
+    monkeypatch.setattr(main.analytics, "get_manufacturers", fake_manufacturers)
+
+    first = client.get("/api/manufacturers")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.json()["manufacturers"] == ["Hero", "Honda"]
+
+    repeat = client.get("/api/manufacturers", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"] == etag
+
+    # Served from memory without rebuilding when the client has no copy
+    assert client.get("/api/manufacturers").json()["manufacturers"] == ["Hero", "Honda"]
+    assert len(builds) == 1
+
+    version["value"] = "/tmp/vehicle_data.db:1:2"
+    changed = client.get("/api/manufacturers", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(builds) == 2
@@ -0,0 +1,43 @@
+"""
+Tests for VahanDataCollector's page parsing
+"""
+
+import types
+
+from data_collector import VahanDataCollector
+
+# No <meta charset>: like the dashboard, the encoding is only given in the HTTP header
+PAGE = (
+    "<html><body><table>"
+    "<tr><th>Date</th><th>Maker</th><th>Category</th><th>Registrations</th></tr>"
+    "<tr><td>2025-01-05</td><td>Škoda Auto</td><td>4W</td><td>१२</td></tr>"
+    "</table></body></html>"
+).encode("utf-8")
+
+def test_parse_tables_decodes_with_the_response_charset():
+    collector = VahanDataCollector()
+
+    tables = collector._parse_tables(PAGE, "utf-8")
+
+    assert tables[0][1] == [["2025-01-05", "Škoda Auto", "4W", "१२"]]
+
+def test_parse_tables_bs4_decodes_with_the_response_charset():
+    collector = VahanDataCollector()
+
+    tables = collector._parse_tables_bs4(PAGE, "utf-8")
+
+    assert tables[0][1] == [["2025-01-05", "Škoda Auto", "4W", "१२"]]
+
+def test_parse_tables_falls_back_when_lxml_does_not_know_the_charset():
+    collector = VahanDataCollector()
+
+    tables = collector._parse_tables(PAGE, "x-garbage")
+
+    assert tables[0][1][0][0] == "2025-01-05"
+
+def test_response_encoding_ignores_unknown_charsets():
+    collector = VahanDataCollector()
+
+    assert collector._response_encoding("u", types.SimpleNamespace(charset="x-garbage")) == "utf-8"
+    assert collector._response_encoding("u", types.SimpleNamespace(charset=None)) == "utf-8"
+    assert collector._response_encoding("u", types.SimpleNamespace(charset="windows-1252")) == "windows-1252"
@@ -0,0 +1,279 @@
+"""
+Tests for DatabaseManager against throwaway SQLite files
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from database import DatabaseManager
+
+async def _with_db(path, body):
+    db = DatabaseManager(str(path))
+    try:
+        await db.initialize()
+        return await body(db)
+    finally:
+        await db.close()
+
+def test_initialize_reopens_an_existing_database(tmp_path):
+    path = tmp_path / "vehicle_data.db"
+    rows = [{"date": "2025-01-05", "category": "2W", "registrations": 10, "year": 2025, "month": 1, "quarter": 1}]
+
+    async def run():
+        await _with_db(path, lambda db: db.store_vehicle_data(rows))
+        return await _with_db(path, lambda db: db.get_vehicle_data_count())
+
+    assert asyncio.run(run()) == 1
+
+def test_cache_version_differs_for_a_rebuilt_database(tmp_path):
+    path = tmp_path / "vehicle_data.db"
+
+    async def run():
+        first = await _with_db(path, lambda db: db.get_cache_version())
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(f"{path}{suffix}"):
+                os.remove(f"{path}{suffix}")
+        second = await _with_db(path, lambda db: db.get_cache_version())
+        reopened = await _with_db(path, lambda db: db.get_cache_version())
+        return first, second, reopened
+
+    first, second, reopened = asyncio.run(run())
+    assert first != second
+    assert second == reopened
+
+def test_cache_version_includes_the_database_path(tmp_path):
+    async def run():
+        return (
+            await _with_db(tmp_path / "a.db", lambda db: db.get_cache_version()),
+            await _with_db(tmp_path / "b.db", lambda db: db.get_cache_version()),
+        )
+
+    a, b = asyncio.run(run())
+    assert a.startswith(str(tmp_path / "a.db"))
+    assert b.startswith(str(tmp_path / "b.db"))
+
+def test_monthly_rollup_accepts_non_zero_padded_dates(tmp_path):
+    rows = [
+        {"date": date, "category": "2W", "registrations": count, "year": year, "month": month, "quarter": 1}
+        for date, year, month, count in (
+            ("2024-12-15", 2024, 12, 5), ("2025-01-05", 2025, 1, 10), ("2025-01-20", 2025, 1, 7), ("2025-02-03", 2025, 2, 4)
+        )
+    ]
+
+    async def run(db):
+        await db.store_vehicle_data(rows)
+        assert db.can_use_monthly_rollup("2025-1-1", "2025-1-31")
+        return (
+            await db.get_vehicle_monthly_rollup("2025-1-1", "2025-1-31"),
+            await db.get_category_timeseries("2025-1-1", "2025-1-31"),
+            await db.get_category_timeseries("2025-1-6", "2025-2-3"),
+        )
+
+    rollup, timeseries, partial = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+    assert rollup["registrations"].tolist() == [17]
+    assert timeseries["registrations"].sum() == 17
+    assert partial["registrations"].sum() == 11
+
+def test_get_vehicle_data_returns_a_dataframe(tmp_path):
+    rows = [{"date": "2025-01-05", "category": "2W", "registrations": 10, "year": 2025, "month": 1, "quarter": 1}]
+
+    async def run(db):
+        await db.store_vehicle_data(rows)
+        return await db.get_vehicle_data(category="2W")
+
+    df = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+    assert isinstance(df, pd.DataFrame)
+    assert df["registrations"].tolist() == [10]
+    assert df["date"].dtype.kind == "M"
+
+def test_reads_do_not_wait_for_the_shared_connection(tmp_path):
+    rows = [{"date": "2025-01-05", "category": "2W", "registrations": 10, "year": 2025, "month": 1, "quarter": 1}]
+
+    async def run(db):
+        await db.store_vehicle_data(rows)
+        async with db._connect() as writer:
+            # While a writer holds the shared connection mid-transaction, pooled readers
+            # still answer, from the last committed state
+            await writer.execute("BEGIN IMMEDIATE")
+            await writer.execute("UPDATE stats SET value = 99 WHERE name = 'vehicle_rows'")
+            counts = await asyncio.wait_for(
+                asyncio.gather(db.get_vehicle_data_count(), db.get_vehicle_data(category="2W")), timeout=5
+            )
+            await writer.execute("ROLLBACK")
+        return counts
+
+    count, df = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+    assert count == 1
+    assert df["registrations"].tolist() == [10]
+
+def _vehicle_rows():
+    """Three dates a month from Nov 2024 to Mar 2025; no 3W in January, EV outside the pivot"""
+    rows = []
+    for year, month in ((2024, 11), (2024, 12), (2025, 1), (2025, 2), (2025, 3)):
+        for day in (3, 15, 28):
+            for index, category in enumerate(("2W", "3W", "4W", "EV")):
+                if category == "3W" and month == 1:
+                    continue
+                rows.append({
+                    "date": f"{year:04d}-{month:02d}-{day:02d}", "year": year, "month": month,
+                    "quarter": (month - 1) // 3 + 1, "category": category,
+                    "registrations": (day * 7 + month * 13 + index * 31) % 500 + 1,
+                })
+    return rows
+
+def _manufacturer_rows():
+    rows = []
+    for record in _vehicle_rows():
+        for index, manufacturer in enumerate(("Hero", "Honda", "Tata")):
+            rows.append(dict(record, manufacturer=manufacturer, registrations=record["registrations"] * (index + 1)))
+    return rows
+
+def _data_version(cache_version):
+    return int(cache_version.rsplit(":", 1)[1])
+
+def _monthly(rows, keys):
+    """Plain pandas aggregation of the raw rows, as {(year, month, *keys): registrations}"""
+    frame = pd.DataFrame(rows)
+    totals = frame.groupby(["year", "month", *keys])["registrations"].sum()
+    return {key: int(value) for key, value in totals.items()}
+
+def _columns_monthly(columns, keys):
+    return {
+        (int(year), int(month), *(row_keys)): int(registrations)
+        for year, month, *row_keys, registrations in zip(
+            columns["year"], columns["month"], *(columns[key] for key in keys), columns["registrations"]
+        )
+    }
+
+def test_store_upserts_changes_and_tracks_counts_and_version(tmp_path):
+    rows = _vehicle_rows()
+
+    async def run(db):
+        start = _data_version(await db.get_cache_version())
+        await db.store_vehicle_data(rows)
+        stored = (_data_version(await db.get_cache_version()), await db.get_vehicle_data_count())
+
+        # The same batch again changes nothing
+        await db.store_vehicle_data(rows)
+        unchanged = (_data_version(await db.get_cache_version()), await db.get_vehicle_data_count())
+
+        # One revised count, one new row, and a duplicate key whose last occurrence wins
+        revised = dict(rows[0], registrations=999)
+        added = dict(rows[0], category="E-Rickshaw")
+        await db.store_vehicle_data([dict(rows[0], registrations=1), revised, added])
+        changed = (_data_version(await db.get_cache_version()), await db.get_vehicle_data_count())
+
+        return start, stored, unchanged, changed, await db.get_vehicle_data()
+
+    start, stored, unchanged, changed, df = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+    assert stored == (start + 1, len(rows))
+    assert unchanged == stored
+    assert changed == (start + 2, len(rows) + 1)
+
+    first = df[(df["date"] == pd.Timestamp(rows[0]["date"])) & (df["category"] == rows[0]["category"])]
+    assert first["registrations"].tolist() == [999]
+    assert (df["category"] == "E-Rickshaw").sum() == 1
+
+def test_manufacturer_store_tracks_counts_and_names(tmp_path):
+    rows = _manufacturer_rows()
+
+    async def run(db):
+        await db.store_manufacturer_data(rows)
+        await db.store_manufacturer_data(rows[:10])
+        return await db.get_manufacturer_data_count(), await db.get_manufacturers()
+
+    count, names = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+    assert count == len(rows)
+    assert names == ["Hero", "Honda", "Tata"]
+
+def test_monthly_rollups_match_a_plain_aggregation(tmp_path):
+    vehicle_rows, manufacturer_rows = _vehicle_rows(), _manufacturer_rows()
+
+    async def run(db):
+        await db.store_vehicle_data(vehicle_rows)
+        await db.store_manufacturer_data(manufacturer_rows)
+        # A revision has to refresh its month's rollup
+        vehicle_rows[-1]["registrations"] += 1000
+        await db.store_vehicle_data(vehicle_rows[-1:])
+        return (
+            await db.get_vehicle_monthly_rollup(),
+            await db.get_vehicle_monthly_rollup("2024-12-01", "2025-02-28", "4W"),
+            await db.get_manufacturer_monthly_rollup(manufacturers=["Honda", "Tata"]),
+        )
+
+    vehicle, vehicle_filtered, manufacturer = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+    assert _columns_monthly(vehicle, ["category"]) == _monthly(vehicle_rows, ["category"])
+
+    in_range = [
+        row for row in vehicle_rows if "2024-12-01" <= row["date"] <= "2025-02-28" and row["category"] == "4W"
+    ]
+    assert _columns_monthly(vehicle_filtered, ["category"]) == _monthly(in_range, ["category"])
+
+    selected = [row for row in manufacturer_rows if row["manufacturer"] in ("Honda", "Tata")]
+    assert _columns_monthly(manufacturer, ["manufacturer", "category"]) == _monthly(selected, ["manufacturer", "category"])
+
+@pytest.mark.parametrize("start_date, end_date, expected", [
+    (None, None, True),
+    ("2025-01-01", "2025-03-31", True),
+    ("2025-1-1", "2025-2-28", True),
+    ("2024-02-01", "2024-02-29", True),
+    ("2025-01-02", None, False),
+    (None, "2025-02-27", False),
+    ("2025-02-30", None, False),
+    ("01/01/2025", None, False),
+])
+def test_can_use_monthly_rollup(start_date, end_date, expected):
+    assert DatabaseManager(":memory:").can_use_monthly_rollup(start_date, end_date) is expected
+
+@pytest.mark.parametrize("start_date, end_date, category", [
+    (None, None, None),
+    ("2024-12-01", "2025-01-31", None),
+    ("2024-12-15", "2025-02-15", "2W"),
+    ("2024-11-16", None, None),
+    (None, "2025-1-3", "EV"),
+    ("2025-03-28", "2025-03-28", None),
+])
+def test_timeseries_bounds_match_plain_filtering(tmp_path, start_date, end_date, category):
+    rows = _vehicle_rows()
+
+    async def run(db):
+        await db.store_vehicle_data(rows)
+        return await db.get_category_timeseries(start_date, end_date, category)
+
+    def iso(date_str):
+        return datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+    expected_rows = [
+        row for row in rows
+        if (start_date is None or row["date"] >= iso(start_date))
+        and (end_date is None or row["date"] <= iso(end_date))
+        and (category is None or row["category"] == category)
+    ]
+    columns = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+    assert _columns_monthly(columns, ["category"]) == _monthly(expected_rows, ["category"])
+
+def test_category_pivot_matches_a_plain_aggregation(tmp_path):
+    rows = _vehicle_rows()
+
+    async def run(db):
+        await db.store_vehicle_data(rows)
+        return await db.get_category_pivot("2024-11-15", None, months=3)
+
+    pivot = asyncio.run(_with_db(tmp_path / "vehicle_data.db", run))
+
+    frame = pd.DataFrame([row for row in rows if row["date"] >= "2024-11-15"])
+    table = frame.pivot_table(index=["year", "month"], columns="category", values="registrations", aggfunc="sum")
+    latest = table.tail(3)
+
+    assert list(zip(pivot["year"].tolist(), pivot["month"].tolist())) == list(latest.index)
+    for category in ("2W", "3W", "4W"):
+        np.testing.assert_array_equal(pivot[category], latest[category].to_numpy(dtype=np.float64))
+    # January has no 3W rows, and EV counts toward the total but gets no column
+    assert np.isnan(pivot["3W"][0])
+    assert "EV" not in pivot
+    assert pivot["total"].tolist() == latest.sum(axis=1).astype(int).tolist()
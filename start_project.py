@@ -4,6 +4,7 @@ Startup script for the Vehicle Registration Dashboard
 This script starts both the Python backend and the React frontend
 """
 
+import hashlib
 import subprocess
 import sys
 import os
@@ -20,14 +21,19 @@ def run_command(command, cwd=None, shell=False):
             shell=shell,
             cwd=cwd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1
+            stderr=subprocess.STDOUT
         )
         
-        # Print output in real-time
-        for line in iter(process.stdout.readline, ''):
-            print(line.rstrip())
+        # Pass output through in real-time, as raw blocks rather than decoded lines
+        sys.stdout.flush()
+        fd = process.stdout.fileno()
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+        process.stdout.close()
             
         process.wait()
         return process.returncode
@@ -35,6 +41,24 @@ def run_command(command, cwd=None, shell=False):
         print(f"Error running command: {e}")
         return 1
 
+def file_digest(*paths):
+    """SHA-256 over the contents of the given files; missing files count as empty"""
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        contents = path.read_bytes() if path.exists() else b""
+        # Length-prefixed so moving bytes from one file to the next changes the digest
+        digest.update(f"{path.name}:{len(contents)}:".encode())
+        digest.update(contents)
+    return digest.hexdigest()
+
+def stamp_matches(stamp_path, digest):
+    """Whether the stamp file records the given digest"""
+    try:
+        return Path(stamp_path).read_text().strip() == digest
+    except OSError:
+        return False
+
 def install_python_dependencies():
     """Install Python dependencies"""
     print("🐍 Installing Python dependencies...")
@@ -61,12 +85,20 @@ def install_python_dependencies():
         python_path = venv_dir / "bin" / "python"
         pip_path = venv_dir / "bin" / "pip"
     
+    # Skip pip entirely when requirements.txt is unchanged since the last install
+    requirements_hash = file_digest(backend_dir / "requirements.txt")
+    stamp_path = venv_dir / ".req.sha256"
+    if stamp_matches(stamp_path, requirements_hash):
+        print("✅ Python dependencies are up to date")
+        return True
+    
     print("📥 Installing requirements...")
     result = run_command([str(pip_path), "install", "-r", "requirements.txt"], cwd=backend_dir)
     if result != 0:
         print("❌ Failed to install Python dependencies")
         return False
     
+    stamp_path.write_text(requirements_hash)
     print("✅ Python dependencies installed successfully!")
     return True
 
@@ -79,11 +111,24 @@ def install_node_dependencies():
         print("❌ Frontend directory not found!")
         return False
     
+    # Skip npm when package.json and the lock file are both unchanged since the last install;
+    # a dependency added to package.json alone must still trigger npm install
+    package_path = frontend_dir / "package.json"
+    lock_path = frontend_dir / "package-lock.json"
+    manifest_hash = file_digest(package_path, lock_path) if package_path.exists() else None
+    stamp_path = frontend_dir / "node_modules" / ".npm.sha256"
+    if manifest_hash and stamp_matches(stamp_path, manifest_hash):
+        print("✅ Node.js dependencies are up to date")
+        return True
+    
     result = run_command(["npm", "install"], cwd=frontend_dir)
     if result != 0:
         print("❌ Failed to install Node.js dependencies")
         return False
     
+    # npm may create or rewrite package-lock.json, so stamp what is there now
+    if package_path.exists() and stamp_path.parent.exists():
+        stamp_path.write_text(file_digest(package_path, lock_path))
     print("✅ Node.js dependencies installed successfully!")
     return True
 